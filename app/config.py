@@ -6,17 +6,97 @@ class Settings:
     """Application settings loaded from environment variables.
 
     CRON_SCHEDULE: APScheduler cron string (minute hour day month day_of_week).
-    DATA_FILE: Path to persisted aggregated data JSON.
+    STORE_BACKEND: "sqlite" (default, incremental upserts) or "json".
+    DATA_FILE: Path to persisted aggregated data JSON (also seeds an empty SQLite store).
+    DB_FILE: Path to the SQLite database used by the sqlite backend.
+    STATS_FILE: Path to the /stats aggregates persisted alongside the dataset.
+    HISTORY_DIR: Directory of dated columnar snapshots (one partition per day).
+    MOMENTUM_FILE: Per-item growth state (last counters + EWMA of daily rates).
+    SEED_FILE: Example dataset served (scored, not persisted) while the store is empty; "" disables.
+    SCORE_MODE: "absolute" (default) or "momentum" to blend growth into popularity_score.
+    SCORE_NORMALIZATION: "caps" (default, fixed per-metric caps) or "quantile" (percentile ranks).
+    SKETCH_FILE: Per-run quantile sketches behind SCORE_NORMALIZATION=quantile.
     YOUTUBE_API_KEY, DISCOURSE_API_KEY, DISCOURSE_API_USERNAME: Optional API creds.
     """
 
     CRON_SCHEDULE: str = os.getenv("CRON_SCHEDULE", "0 3 * * *")  # daily at 03:00
 
+    # ISO 3166-1 alpha-2 country codes to collect (comma-separated)
+    COUNTRIES: tuple = tuple(
+        c.strip().upper() for c in os.getenv("COUNTRIES", "US,IN").split(",") if c.strip()
+    )
+
     BASE_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     DATA_FILE: str = os.getenv(
         "DATA_FILE",
         os.path.join(BASE_DIR, "store", "data", "workflows.json"),
     )
+    STORE_BACKEND: str = os.getenv("STORE_BACKEND", "sqlite").lower()
+    DB_FILE: str = os.getenv("DB_FILE", os.path.join(BASE_DIR, "store", "data", "workflows.sqlite3"))
+    STATS_FILE: str = os.getenv("STATS_FILE", os.path.join(os.path.dirname(DATA_FILE), "stats.json"))
+    HISTORY_DIR: str = os.getenv("HISTORY_DIR", os.path.join(BASE_DIR, "store", "history"))
+    MOMENTUM_FILE: str = os.getenv("MOMENTUM_FILE", os.path.join(os.path.dirname(DATA_FILE), "momentum.json"))
+    SEED_FILE: str = os.getenv("SEED_FILE", os.path.join(BASE_DIR, "seeds", "workflows_seed.json"))
+
+    # Multi-worker deployments: one process holds LEADER_LOCK_FILE and runs the
+    # scheduler; INGEST_LOCK_FILE serializes refreshes across processes. Both must
+    # live on storage shared by all workers. Readers poll the dataset version at
+    # most every SNAPSHOT_POLL_S seconds.
+    LEADER_LOCK_FILE: str = os.getenv("LEADER_LOCK_FILE", os.path.join(os.path.dirname(DB_FILE), "leader.lock"))
+    INGEST_LOCK_FILE: str = os.getenv("INGEST_LOCK_FILE", os.path.join(os.path.dirname(DB_FILE), "ingest.lock"))
+    LEADER_RETRY_S: float = float(os.getenv("LEADER_RETRY_S", "30"))
+    SNAPSHOT_POLL_S: float = float(os.getenv("SNAPSHOT_POLL_S", "1.0"))
+
+    SCORE_MODE: str = os.getenv("SCORE_MODE", "absolute").lower()
+    # Quantile normalization keeps a KLL sketch (SKETCH_K values per level) for
+    # each platform/country/metric of the last SKETCH_RUNS refreshes.
+    SCORE_NORMALIZATION: str = os.getenv("SCORE_NORMALIZATION", "caps").lower()
+    SKETCH_FILE: str = os.getenv("SKETCH_FILE", os.path.join(os.path.dirname(DATA_FILE), "score_sketches.json"))
+    SKETCH_K: int = int(os.getenv("SKETCH_K", "200"))
+    SKETCH_RUNS: int = int(os.getenv("SKETCH_RUNS", "7"))
+    MOMENTUM_ALPHA: float = float(os.getenv("MOMENTUM_ALPHA", "0.3"))  # EWMA weight of the newest rate
+    MOMENTUM_MIN_DAYS: float = float(os.getenv("MOMENTUM_MIN_DAYS", "0.5"))
+    # Jaccard similarity of title tokens needed to merge items into one workflow entity
+    ENTITY_MIN_SIMILARITY: float = float(os.getenv("ENTITY_MIN_SIMILARITY", "0.5"))
+    # Weight of popularity_score added to BM25 relevance in /workflows/search
+    SEARCH_POPULARITY_WEIGHT: float = float(os.getenv("SEARCH_POPULARITY_WEIGHT", "1.0"))
+
+    # Ingestion concurrency: worker threads for the (platform, country) fan-out,
+    # the shared HTTP connection pool size and the per-host in-flight cap.
+    INGEST_WORKERS: int = int(os.getenv("INGEST_WORKERS", "6"))
+    HTTP_POOL_SIZE: int = int(os.getenv("HTTP_POOL_SIZE", "20"))
+    HTTP_HOST_CONCURRENCY: int = int(os.getenv("HTTP_HOST_CONCURRENCY", "8"))
+
+    # Streaming ingestion: fetched items wait in a queue of at most
+    # INGEST_QUEUE_SIZE, are scored and committed to INGEST_STAGING_FILE in
+    # batches of INGEST_BATCH_SIZE. An interrupted refresh younger than
+    # INGEST_RESUME_MAX_AGE_H hours resumes from its finished sources.
+    INGEST_QUEUE_SIZE: int = int(os.getenv("INGEST_QUEUE_SIZE", "1000"))
+    INGEST_BATCH_SIZE: int = int(os.getenv("INGEST_BATCH_SIZE", "500"))
+    INGEST_STAGING_FILE: str = os.getenv(
+        "INGEST_STAGING_FILE", os.path.join(os.path.dirname(DB_FILE), "ingest_staging.sqlite3")
+    )
+    INGEST_RESUME_MAX_AGE_H: float = float(os.getenv("INGEST_RESUME_MAX_AGE_H", "12"))
+
+    # Persistent HTTP response cache for source APIs (empty HTTP_CACHE_FILE disables it).
+    # Entries younger than HTTP_CACHE_TTL seconds are served without a request;
+    # older ones are revalidated with If-None-Match / If-Modified-Since.
+    HTTP_CACHE_FILE: str = os.getenv("HTTP_CACHE_FILE", os.path.join(BASE_DIR, "store", "cache", "http_cache.sqlite3"))
+    HTTP_CACHE_TTL: float = float(os.getenv("HTTP_CACHE_TTL", "3600"))
+    HTTP_CACHE_MAX_MB: float = float(os.getenv("HTTP_CACHE_MAX_MB", "256"))
+
+    # In-memory cache of serialized GET /workflows and /stats responses, keyed by
+    # path, normalized query and dataset version (0 disables it).
+    RESPONSE_CACHE_MAX_MB: float = float(os.getenv("RESPONSE_CACHE_MAX_MB", "64"))
+    # Cache-Control for downstream caches: a short max-age, then stale-while-revalidate
+    # (both capped by the next CRON_SCHEDULE run; a missed run sends no-cache)
+    RESPONSE_MAX_AGE_S: int = int(os.getenv("RESPONSE_MAX_AGE_S", "60"))
+    RESPONSE_STALE_S: int = int(os.getenv("RESPONSE_STALE_S", "600"))
+
+    # Per-source request timeouts (seconds)
+    YOUTUBE_TIMEOUT: float = float(os.getenv("YOUTUBE_TIMEOUT", "15"))
+    FORUM_TIMEOUT: float = float(os.getenv("FORUM_TIMEOUT", "20"))
+    TRENDS_TIMEOUT: float = float(os.getenv("TRENDS_TIMEOUT", "25"))
 
     # Optional proxies/retries for Google Trends
     TRENDS_PROXY_HTTP: Optional[str] = os.getenv("TRENDS_PROXY_HTTP")
@@ -24,12 +104,37 @@ class Settings:
     TRENDS_RETRIES: int = int(os.getenv("TRENDS_RETRIES", "2"))
     TRENDS_BACKOFF: float = float(os.getenv("TRENDS_BACKOFF", "0.1"))
 
+    # Adaptive (AIMD) Trends pacing in requests/second, and keywords per payload (max 5)
+    TRENDS_RATE: float = float(os.getenv("TRENDS_RATE", "0.5"))
+    TRENDS_MIN_RATE: float = float(os.getenv("TRENDS_MIN_RATE", "0.05"))
+    TRENDS_MAX_RATE: float = float(os.getenv("TRENDS_MAX_RATE", "2"))
+    TRENDS_GROUP_SIZE: int = min(5, int(os.getenv("TRENDS_GROUP_SIZE", "5")))
+
+    # Trends geo strategy: "per_country" (one timeseries per geo), "region" (one
+    # worldwide timeseries + interest_by_region per keyword group for all geos) or
+    # "auto" (region once more than TRENDS_REGION_MIN_COUNTRIES are configured).
+    TRENDS_GEO_MODE: str = os.getenv("TRENDS_GEO_MODE", "auto").lower()
+    TRENDS_REGION_MIN_COUNTRIES: int = int(os.getenv("TRENDS_REGION_MIN_COUNTRIES", "3"))
+    # Computed Trends metrics are cached per (keyword, geo, timeframe) for this long
+    TRENDS_CACHE_TTL: float = float(os.getenv("TRENDS_CACHE_TTL", "43200"))
+
     # Optional external API credentials
     YOUTUBE_API_KEY: Optional[str] = os.getenv("YOUTUBE_API_KEY")
+    YOUTUBE_API_BASE: str = os.getenv("YOUTUBE_API_BASE", "https://www.googleapis.com/youtube/v3")
+    # Search queries (comma-separated); empty = "n8n workflow" plus TRENDS_KEYWORDS
+    YOUTUBE_QUERIES: str = os.getenv("YOUTUBE_QUERIES", "")
+    YOUTUBE_MAX_PAGES: int = int(os.getenv("YOUTUBE_MAX_PAGES", "2"))  # search pages (50 results) per query/country
+    # Quota units one refresh may spend, split evenly across COUNTRIES (search.list = 100,
+    # videos.list = 1; default daily quota is 10000). The defaults (21 queries, 2 countries,
+    # 2 pages) need 21 x 2 x 2 x 101 = 8484 units.
+    YOUTUBE_QUOTA_BUDGET: int = int(os.getenv("YOUTUBE_QUOTA_BUDGET", "9000"))
 
     DISCOURSE_BASE_URL: str = os.getenv("DISCOURSE_BASE_URL", "https://community.n8n.io")
     DISCOURSE_API_KEY: Optional[str] = os.getenv("DISCOURSE_API_KEY")
     DISCOURSE_API_USERNAME: Optional[str] = os.getenv("DISCOURSE_API_USERNAME")
+    FORUM_MAX_TOPICS: int = int(os.getenv("FORUM_MAX_TOPICS", "40"))
+    FORUM_DETAIL_LIMIT: int = int(os.getenv("FORUM_DETAIL_LIMIT", "20"))
+    FORUM_DETAIL_CONCURRENCY: int = int(os.getenv("FORUM_DETAIL_CONCURRENCY", "8"))
 
     # Google Trends keywords (comma-separated). Defaults to a curated list.
     TRENDS_KEYWORDS: str = os.getenv(
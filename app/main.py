@@ -1,17 +1,20 @@
 from __future__ import annotations
 import os
-import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.routers import workflows, stats, admin, health
 from app.store import repository
-from app.services.ingestion import collect_all
+from app.services import jobs
+from app.sched.leader import LeaderElection
 from app.sched.scheduler import Scheduler
+from app.utils import metrics, response_cache
 
 
 app = FastAPI(title="n8n Workflow Popularity API", version="0.1.0")
 
+# Registered before CORS so that cached responses and 304s still get CORS headers
+app.middleware("http")(response_cache.middleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -19,6 +22,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so API timings include cache hits and CORS handling
+app.middleware("http")(metrics.api_middleware)
 
 app.include_router(health.router)
 app.include_router(workflows.router)
@@ -27,27 +32,35 @@ app.include_router(admin.router)
 
 
 scheduler: Scheduler | None = None
+election: LeaderElection | None = None
 
 
-@app.on_event("startup")
-async def on_startup():
+def _on_elected():
     # Bootstrap: ensure we have data, but do not block startup
-    def refresh_job():
-        items = collect_all()
-        repository.save_all(items)
+    snapshot = repository.get_snapshot()
+    if snapshot.seeded or not snapshot.items:
+        jobs.submit_refresh(trigger="startup")
 
-    if not repository.load_all():
-        loop = asyncio.get_event_loop()
-        loop.run_in_executor(None, refresh_job)
-
-    # Start scheduler for daily refresh
+    # Start scheduler for daily refresh; shares single-flight with /admin/refresh
     global scheduler
-    scheduler = Scheduler(app, refresh_job)
+    scheduler = Scheduler(app, lambda: jobs.run_refresh(trigger="scheduler"))
     scheduler.start()
 
 
+@app.on_event("startup")
+async def on_startup():
+    # Load the dataset (or the seeds) now so the first request is served from memory
+    repository.get_snapshot()
+    # Only the elected worker ingests; the others serve reads and stand by
+    global election
+    election = LeaderElection(_on_elected)
+    election.start()
+
+
 @app.on_event("shutdown")
 async def on_shutdown():
     global scheduler
     if scheduler:
         scheduler.shutdown()
+    if election:
+        election.stop()
@@ -2,10 +2,11 @@ from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
 
 Platform = Literal["YouTube", "Forum", "Google"]
-Country = Literal["US", "IN"]
+Country = str  # ISO 3166-1 alpha-2 code from settings.COUNTRIES
 
 
 class WorkflowItem(BaseModel):
+    id: Optional[str] = Field(None, description="Stable key: platform:source_id:country")
     workflow: str = Field(..., description="Workflow name or keyword")
     platform: Platform
     popularity_metrics: Dict[str, Any] = Field(
@@ -15,6 +16,8 @@ class WorkflowItem(BaseModel):
     popularity_score: float = Field(..., ge=0, le=1)
     source_url: Optional[str] = None
     source_metadata: Dict[str, Any] = Field(default_factory=dict)
+    momentum_score: Optional[float] = None
+    entity_id: Optional[str] = Field(None, description="Canonical workflow this item was clustered into")
 
 
 class WorkflowsResponse(BaseModel):
@@ -24,8 +27,33 @@ class WorkflowsResponse(BaseModel):
     offset: int
 
 
+class TopWorkflowsResponse(BaseModel):
+    total: int
+    items: List[WorkflowItem]
+    limit: int
+    sort_by: str
+    order: Literal["asc", "desc"]
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor= to fetch the next page")
+
+
+class ScoreSummary(BaseModel):
+    count: int
+    mean: float
+    p50: float
+    p95: float
+
+
+class ScoreHistogram(BaseModel):
+    edges: List[float]
+    counts: Dict[str, List[int]] = Field(..., description="Per-platform counts for each [edge_i, edge_i+1) bin")
+
+
 class StatsResponse(BaseModel):
     updated_at: str
     by_platform: Dict[str, int]
     by_country: Dict[str, int]
     total: int
+    score_summary: Dict[str, ScoreSummary] = Field(default_factory=dict)
+    score_histogram: Optional[ScoreHistogram] = None
+    top_by_country: Dict[str, List[Dict[str, Any]]] = Field(default_factory=dict)
+    seeded: bool = False  # True while SEED_FILE examples stand in for an empty store
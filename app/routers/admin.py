@@ -1,13 +1,28 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 
-from app.services.ingestion import collect_all
-from app.store.repository import save_all
+from app.services import jobs
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-@router.post("/refresh")
+@router.post("/refresh", status_code=202)
 def refresh_data():
-    items = collect_all()
-    save_all(items)
-    return {"status": "ok", "count": len(items)}
+    """Queue a background refresh; joins the running one if a refresh is in flight."""
+    job, created = jobs.submit_refresh(trigger="api")
+    return {**job.to_dict(), "deduplicated": not created, "status_url": f"/admin/refresh/{job.id}"}
+
+
+@router.get("/refresh")
+def latest_refresh():
+    job = jobs.latest_job()
+    if job is None:
+        raise HTTPException(status_code=404, detail="No refresh has run yet")
+    return job.to_dict()
+
+
+@router.get("/refresh/{job_id}")
+def refresh_status(job_id: str):
+    job = jobs.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return job.to_dict()
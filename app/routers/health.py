@@ -1,8 +1,20 @@
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.services import jobs
+from app.utils import metrics
 
 router = APIRouter(tags=["health"]) 
 
 
 @router.get("/health")
 def health():
-    return {"status": "ok"}
+    # Last refresh run by this process (stages, per-source timings); None on standby workers
+    job = jobs.latest_job()
+    return {"status": "ok", "last_refresh": job.to_dict() if job else None}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus text exposition of this process's metrics."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
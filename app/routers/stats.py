@@ -1,10 +1,11 @@
 from fastapi import APIRouter
 
+from app.models import StatsResponse
 from app.store import repository
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
 
-@router.get("/")
+@router.get("/", responses={200: {"model": StatsResponse}})
 def get_stats():
     return repository.stats()
@@ -1,34 +1,175 @@
-from typing import List, Optional
-from fastapi import APIRouter, Query
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 
-from app.store import repository
+from app.config import settings
+from app.models import TopWorkflowsResponse, WorkflowsResponse
+from app.services import entities
+from app.store import export, history, repository, serialize, topk
 
 router = APIRouter(prefix="/workflows", tags=["workflows"])
 
+SORT_ALIASES = {"momentum": "momentum_score"}
+COUNTRY_DESCRIPTION = f"Filter by country (configured: {', '.join(settings.COUNTRIES)})"
+FIELDS_DESCRIPTION = (
+    "Comma-separated fields to return (e.g. workflow,platform,popularity_score,popularity_metrics.views), "
+    "or fields to drop with a leading '-' (e.g. -source_metadata,-popularity_metrics.like_to_view_ratio)"
+)
 
-@router.get("/")
+
+def _projection(fields: Optional[str]) -> Optional[serialize.Projection]:
+    try:
+        return serialize.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _json_page(
+    snapshot: repository.Snapshot,
+    items: Sequence[Dict[str, Any]],
+    projection: Optional[serialize.Projection],
+    meta: List[Tuple[str, Any]],
+) -> Response:
+    """Assemble the response body from per-item JSON bytes, skipping jsonable_encoder."""
+    if projection is None:
+        parts = [snapshot.item_json(it) for it in items]
+    else:
+        parts = [serialize.dumps(projection(it)) for it in items]
+    pairs = list(meta)
+    pairs.insert(1, ("items", serialize.dump_array(parts)))
+    return Response(serialize.dump_object(pairs), media_type="application/json")
+
+
+@router.get("/", response_class=Response, responses={200: {"model": WorkflowsResponse}})
 def list_workflows(
     platform: Optional[str] = Query(None, description="Filter by platform: YouTube, Forum, Google"),
-    country: Optional[str] = Query(None, description="Filter by country: US, IN"),
-    sort_by: Optional[str] = Query("popularity_score", description="Field to sort by"),
+    country: Optional[str] = Query(None, description=COUNTRY_DESCRIPTION),
+    sort_by: Optional[str] = Query("popularity_score", description="Field to sort by (momentum = recent growth)"),
     order: Optional[str] = Query("desc", description="asc or desc"),
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ):
-    items = repository.load_all()
-
-    if platform:
-        items = [i for i in items if i.get("platform") == platform]
-    if country:
-        items = [i for i in items if i.get("country") == country]
-
+    projection = _projection(fields)
+    snapshot = repository.get_snapshot()
     reverse = (order or "desc").lower() == "desc"
-    try:
-        items.sort(key=lambda x: x.get(sort_by, 0) if sort_by != "popularity_score" else float(x.get("popularity_score", 0)), reverse=reverse)
-    except Exception:
-        # Fallback to popularity_score if invalid sort field
-        items.sort(key=lambda x: float(x.get("popularity_score", 0)), reverse=True)
+    sort_by = SORT_ALIASES.get(sort_by, sort_by) or "popularity_score"
+    items = snapshot.ordered(platform, country, sort_by, reverse)
 
     total = len(items)
     sliced = items[offset : offset + limit]
-    return {"total": total, "items": sliced, "limit": limit, "offset": offset}
+    return _json_page(snapshot, sliced, projection, [("total", total), ("limit", limit), ("offset", offset)])
+
+
+@router.get("/top", response_class=Response, responses={200: {"model": TopWorkflowsResponse}})
+def top_workflows(
+    platform: Optional[str] = Query(None, description="Filter by platform: YouTube, Forum, Google"),
+    country: Optional[str] = Query(None, description=COUNTRY_DESCRIPTION),
+    sort_by: str = Query(
+        "popularity_score",
+        description="Top-level field, popularity_metrics.<name>, or a bare metric name (e.g. views, like_to_view_ratio)",
+    ),
+    order: str = Query("desc", description="asc or desc"),
+    limit: int = Query(10, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    projection = _projection(fields)
+    snapshot = repository.get_snapshot()
+    sort_by = SORT_ALIASES.get(sort_by, sort_by)
+    if snapshot.items and not snapshot.sortable(sort_by):
+        raise HTTPException(status_code=400, detail=f"Unknown sort field: {sort_by}")
+    desc = order.lower() != "asc"
+    try:
+        after = topk.decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    page = topk.select(snapshot.keyed(platform, country, sort_by, desc), limit, desc, after)
+    next_cursor = topk.encode_cursor(page[-1][0]) if len(page) == limit else None
+    meta = [
+        ("total", len(snapshot.partition(platform, country))),
+        ("limit", limit),
+        ("sort_by", sort_by),
+        ("order", "desc" if desc else "asc"),
+        ("next_cursor", next_cursor),
+    ]
+    return _json_page(snapshot, [it for _, it in page], projection, meta)
+
+
+@router.get("/export")
+def export_workflows(
+    platform: Optional[str] = Query(None, description="Filter by platform: YouTube, Forum, Google"),
+    country: Optional[str] = Query(None, description=COUNTRY_DESCRIPTION),
+    gzip: bool = Query(False, description="gzip the stream (Content-Encoding: gzip)"),
+):
+    """Stream the full (filtered) dataset as NDJSON, one item per line."""
+    snapshot = repository.get_snapshot()
+    body = export.iter_ndjson(snapshot.partition(platform, country), encode=lambda it: snapshot.item_json(it, store=False))
+    headers = {"X-Dataset-Version": snapshot.version}
+    if gzip:
+        body = export.gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
+
+
+@router.get("/search")
+def search_workflows(
+    q: str = Query(..., min_length=1, description="Words in the workflow title; the last one may be a prefix"),
+    platform: Optional[str] = Query(None, description="Filter by platform: YouTube, Forum, Google"),
+    country: Optional[str] = Query(None, description=COUNTRY_DESCRIPTION),
+    limit: int = Query(20, ge=1, le=100),
+    prefix: bool = Query(True, description="Treat the last word as a prefix (autocomplete-style)"),
+):
+    """Title search ranked by BM25 relevance blended with popularity_score."""
+    hits = repository.search_index().search(q, limit, prefix, platform, country)
+    return {"query": q, "total": len(hits), "items": [{**it, "search_score": s} for s, it in hits], "limit": limit}
+
+
+@router.get("/search/suggest")
+def suggest_terms(
+    q: str = Query(..., min_length=1, description="Partial query; the last word is completed"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    return {"query": q, "suggestions": repository.search_index().suggest(q, limit)}
+
+
+@router.get("/entities")
+def list_entities(
+    platform: Optional[str] = Query(None, description="Only entities with items on this platform"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+):
+    """Canonical workflows (titles clustered across platforms), best combined score first."""
+    rows = repository.get_snapshot().derived("entities", entities.summarize)
+    if platform:
+        rows = [e for e in rows if platform in e["platforms"]]
+    return {"total": len(rows), "items": rows[offset : offset + limit], "limit": limit, "offset": offset}
+
+
+@router.get("/entities/{entity_id}")
+def get_entity(entity_id: str):
+    snapshot = repository.get_snapshot()
+    summary = next((e for e in snapshot.derived("entities", entities.summarize) if e["entity_id"] == entity_id), None)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Entity not found")
+    members = [it for it in snapshot.ordered(None, None, "popularity_score", True) if it.get("entity_id") == entity_id]
+    return {**summary, "members": members}
+
+
+@router.get("/{item_id:path}/history")
+def workflow_history(
+    item_id: str,
+    start: Optional[str] = Query(None, description="First date (YYYY-MM-DD), inclusive"),
+    end: Optional[str] = Query(None, description="Last date (YYYY-MM-DD), inclusive"),
+    columns: str = Query("popularity_score", description=f"Comma-separated: {', '.join(history.COLUMNS)}"),
+    every: str = Query("day", description="Downsample to one point per day, week or month"),
+):
+    cols = [c.strip() for c in columns.split(",") if c.strip()]
+    unknown = [c for c in cols if c not in history.COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown)}")
+    if every not in history.DOWNSAMPLE:
+        raise HTTPException(status_code=400, detail="every must be one of: day, week, month")
+    points = history.query(item_id, cols, start, end, every)
+    return {"id": item_id, "columns": cols, "every": every, "points": points}
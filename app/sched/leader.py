@@ -0,0 +1,100 @@
+"""Leader election across worker processes with exclusive file locks.
+
+With ``uvicorn --workers N`` (or several containers sharing the store volume)
+every process runs the startup hook; only the one holding LEADER_LOCK_FILE
+bootstraps and schedules ingestion. The OS drops the lock when the holder
+exits, so a standby worker takes over on its next retry.
+"""
+from __future__ import annotations
+import os
+import threading
+from typing import Callable, Optional
+
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+class FileLock:
+    """Non-reentrant exclusive ``flock`` on ``path``, held until released or process exit."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self, blocking: bool = False) -> bool:
+        with self._lock:
+            if self._fd is not None:
+                return False
+            if fcntl is None:
+                print(f"[Lock] WARNING: fcntl unavailable; {self.path} is not enforced across processes")
+                self._fd = -1
+                return True
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except OSError:
+                os.close(fd)
+                return False
+            # Record the holder for humans inspecting the lock file
+            os.ftruncate(fd, 0)
+            os.write(fd, f"{os.getpid()}\n".encode("ascii"))
+            self._fd = fd
+            return True
+
+    def release(self):
+        with self._lock:
+            fd, self._fd = self._fd, None
+            if fd is None or fd < 0:
+                return
+            try:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            finally:
+                os.close(fd)
+
+
+class LeaderElection:
+    """Acquire LEADER_LOCK_FILE now or keep retrying; call ``on_elected`` once when won."""
+
+    def __init__(self, on_elected: Callable[[], None], path: Optional[str] = None, interval: Optional[float] = None):
+        self.on_elected = on_elected
+        self.lock = FileLock(path or settings.LEADER_LOCK_FILE)
+        self.interval = settings.LEADER_RETRY_S if interval is None else interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self.lock.held
+
+    def start(self):
+        if self._try():
+            return
+        print(f"[Leader] pid {os.getpid()} is a standby; retrying every {self.interval:g}s")
+        self._thread = threading.Thread(target=self._campaign, name="leader-election", daemon=True)
+        self._thread.start()
+
+    def _try(self) -> bool:
+        if not self.lock.acquire():
+            return False
+        print(f"[Leader] pid {os.getpid()} is the ingestion leader")
+        self.on_elected()
+        return True
+
+    def _campaign(self):
+        while not self._stop.wait(self.interval):
+            if self._try():
+                return
+
+    def stop(self):
+        self._stop.set()
+        self.lock.release()
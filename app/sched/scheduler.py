@@ -6,6 +6,12 @@ from fastapi import FastAPI
 from app.config import settings
 
 
+def cron_trigger() -> CronTrigger:
+    # Parse CRON_SCHEDULE: "min hour day month dow"
+    minute, hour, day, month, dow = settings.CRON_SCHEDULE.split()
+    return CronTrigger(minute=minute, hour=hour, day=day, month=month, day_of_week=dow)
+
+
 class Scheduler:
     def __init__(self, app: FastAPI, job_func):
         self.app = app
@@ -13,10 +19,7 @@ class Scheduler:
         self.scheduler = BackgroundScheduler(timezone="UTC")
 
     def start(self):
-        # Parse CRON_SCHEDULE: "min hour day month dow"
-        minute, hour, day, month, dow = settings.CRON_SCHEDULE.split()
-        trigger = CronTrigger(minute=minute, hour=hour, day=day, month=month, day_of_week=dow)
-        self.scheduler.add_job(self.job_func, trigger, id="refresh_job", replace_existing=True)
+        self.scheduler.add_job(self.job_func, cron_trigger(), id="refresh_job", replace_existing=True)
         self.scheduler.start()
 
     def shutdown(self):
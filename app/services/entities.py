@@ -0,0 +1,162 @@
+"""Cross-platform entity resolution: cluster item titles into canonical workflows.
+
+Titles are normalized to token sets and clustered in one pass. An inverted
+index from token pairs to clusters limits comparisons to a few plausible
+candidates, so the cost stays close to linear in the number of items rather
+than O(n^2) pairwise.
+"""
+from __future__ import annotations
+import hashlib
+import re
+import unicodedata
+from itertools import combinations
+from typing import Any, Dict, FrozenSet, List, Sequence, Tuple
+
+from app.config import settings
+
+
+STOPWORDS = frozenset(
+    """
+    n8n a an and the to for of in on with by from your you my our how what why is are this that
+    workflow workflows automation automations automate automated automating integration integrations
+    tutorial tutorials guide beginner beginners step course build building create using use free
+    easy full complete best new vs via into part video
+    """.split()
+)
+# Combined score weights of each platform's best item in a cluster
+PLATFORM_WEIGHTS = {"YouTube": 0.4, "Forum": 0.3, "Google": 0.3}
+# Rarest tokens of a title used to build its blocking keys (token pairs)
+BLOCK_TOKENS = 3
+# Clusters checked per blocking key; bounds the work for very common keys
+MAX_POSTINGS = 16
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(title: str) -> FrozenSet[str]:
+    """Lowercased, accent-stripped content tokens with a light plural stem."""
+    text = unicodedata.normalize("NFKD", title or "").encode("ascii", "ignore").decode("ascii").lower()
+    tokens = set()
+    for tok in _TOKEN_RE.findall(text):
+        if tok in STOPWORDS or tok.isdigit() or len(tok) < 2:
+            continue
+        if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        tokens.add(tok)
+    return frozenset(tokens)
+
+
+def _entity_id(signature: FrozenSet[str]) -> str:
+    return hashlib.sha1(" ".join(sorted(signature)).encode("utf-8")).hexdigest()[:12]
+
+
+def _blocking_keys(tokens: FrozenSet[str], df: Dict[str, int]) -> List[Tuple[str, ...]]:
+    """Index keys for a token set: pairs of its BLOCK_TOKENS rarest tokens.
+
+    Titles similar enough to merge share most of their tokens, so they almost
+    always share a pair among their rarest ones, while titles that only have
+    one common word ("slack") in common never meet. Sets of one or two tokens
+    are also keyed by each token, since those can reach 0.5 on one shared token.
+    """
+    ordered = sorted(tokens, key=lambda t: (df.get(t, 0), t))[:BLOCK_TOKENS]
+    keys: List[Tuple[str, ...]] = [tuple(sorted(p)) for p in combinations(ordered, 2)]
+    if len(tokens) <= 2:
+        keys.extend((t,) for t in ordered)
+    return keys
+
+
+def resolve_entities(items: Sequence[Dict[str, Any]], min_similarity: float = None) -> int:
+    """Assign ``entity_id`` to every item in place; returns the number of clusters.
+
+    Each item joins the candidate cluster with the highest Jaccard similarity
+    to the cluster's signature (the token set of its first member) when it
+    reaches ``min_similarity``; otherwise it starts a new cluster. Candidates
+    come from the blocking-key index, so each item is compared with a handful
+    of clusters instead of all of them.
+    """
+    threshold = settings.ENTITY_MIN_SIMILARITY if min_similarity is None else min_similarity
+    token_sets = [normalize(it.get("workflow", "")) for it in items]
+    df: Dict[str, int] = {}
+    for tokens in token_sets:
+        for tok in tokens:
+            df[tok] = df.get(tok, 0) + 1
+
+    signatures: List[FrozenSet[str]] = []
+    ids: List[str] = []
+    by_signature: Dict[FrozenSet[str], int] = {}
+    postings: Dict[Tuple[str, ...], List[int]] = {}
+
+    for it, tokens in zip(items, token_sets):
+        if not tokens:
+            it["entity_id"] = None
+            continue
+
+        best = by_signature.get(tokens)
+        if best is None:
+            keys = _blocking_keys(tokens, df)
+            best_sim = 0.0
+            seen = set()
+            for key in keys:
+                # Very common keys only have their most recent clusters checked
+                for cid in postings.get(key, ())[-MAX_POSTINGS:]:
+                    if cid in seen:
+                        continue
+                    seen.add(cid)
+                    sig = signatures[cid]
+                    common = len(tokens & sig)
+                    sim = common / (len(tokens) + len(sig) - common)
+                    if sim > best_sim:
+                        best, best_sim = cid, sim
+            if best_sim < threshold:
+                best = len(signatures)
+                signatures.append(tokens)
+                ids.append(_entity_id(tokens))
+                by_signature[tokens] = best
+                for key in keys:
+                    postings.setdefault(key, []).append(best)
+        it["entity_id"] = ids[best]
+
+    return len(signatures)
+
+
+def summarize(items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-entity rollup, best combined score first.
+
+    ``combined_score`` is the PLATFORM_WEIGHTS-weighted sum of the best
+    popularity_score on each platform, so a workflow popular everywhere
+    outranks one that is popular on a single platform.
+    """
+    groups: Dict[str, Dict[str, Any]] = {}
+    for it in items:
+        eid = it.get("entity_id")
+        if not eid:
+            continue
+        g = groups.get(eid)
+        if g is None:
+            g = groups[eid] = {"entity_id": eid, "name": None, "keyword": None, "items": 0, "platforms": {}, "countries": set()}
+        g["items"] += 1
+        g["countries"].add(it.get("country"))
+        if g["name"] is None:
+            g["name"] = it.get("workflow")
+        if it.get("platform") == "Google" and g["keyword"] is None:
+            g["keyword"] = it.get("workflow")
+        p = g["platforms"].setdefault(it.get("platform"), {"count": 0, "max_score": 0.0})
+        p["count"] += 1
+        p["max_score"] = max(p["max_score"], float(it.get("popularity_score") or 0))
+
+    out = []
+    for g in groups.values():
+        combined = sum(PLATFORM_WEIGHTS.get(p, 0.0) * v["max_score"] for p, v in g["platforms"].items())
+        out.append(
+            {
+                "entity_id": g["entity_id"],
+                # A curated Trends keyword is the best canonical name when present
+                "name": g["keyword"] or g["name"],
+                "combined_score": round(min(1.0, combined), 6),
+                "items": g["items"],
+                "platforms": g["platforms"],
+                "countries": sorted(c for c in g["countries"] if c),
+            }
+        )
+    out.sort(key=lambda e: e["combined_score"], reverse=True)
+    return out
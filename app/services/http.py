@@ -0,0 +1,146 @@
+from __future__ import annotations
+import json
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import settings
+from app.services.http_cache import get_cache
+from app.utils import metrics
+
+
+# Hosts that tolerate less parallelism than HTTP_HOST_CONCURRENCY.
+HOST_LIMITS: Dict[str, int] = {"trends.google.com": 1}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_host_slots: Dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Process-wide session with a keep-alive connection pool shared by all fetchers."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=settings.HTTP_POOL_SIZE)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc or url
+
+
+@contextmanager
+def host_slot(host: str) -> Iterator[None]:
+    """Bound the number of in-flight requests to a single host across threads."""
+    with _host_slots_lock:
+        sem = _host_slots.get(host)
+        if sem is None:
+            sem = threading.BoundedSemaphore(HOST_LIMITS.get(host, settings.HTTP_HOST_CONCURRENCY))
+            _host_slots[host] = sem
+    with sem:
+        yield
+
+
+def get(url: str, timeout: float, **kwargs) -> requests.Response:
+    host = host_of(url)
+    with host_slot(host):
+        start = time.perf_counter()
+        try:
+            resp = get_session().get(url, timeout=timeout, **kwargs)
+        except requests.RequestException as e:
+            metrics.fetch_requests.inc(host=host, status=type(e).__name__)
+            raise
+        finally:
+            # Time on the wire only, not the wait for a host slot
+            metrics.fetch_seconds.observe(time.perf_counter() - start, host=host)
+    metrics.fetch_requests.inc(host=host, status=str(resp.status_code))
+    metrics.fetch_bytes.inc(len(resp.content), host=host)
+    return resp
+
+
+def get_json(
+    url: str,
+    timeout: float,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    ttl: Optional[float] = None,
+    version: Optional[str] = None,
+) -> Any:
+    """GET a JSON document through the persistent HTTP cache.
+
+    A cached entry is returned without a request when its ``version`` matches
+    the caller's, or when it is younger than ``ttl`` (HTTP_CACHE_TTL by
+    default). Otherwise the request is made conditional on the stored
+    ETag/Last-Modified and a 304 reuses the cached body.
+    """
+    cache = get_cache()
+    if cache is None:
+        resp = get(url, timeout=timeout, params=params, headers=headers)
+        resp.raise_for_status()
+        return resp.json()
+
+    ttl = settings.HTTP_CACHE_TTL if ttl is None else ttl
+    host = host_of(url)
+    key = cache.make_key(url, params)
+    entry = cache.lookup(key)
+    if entry is not None:
+        if (version is not None and entry.version == version) or (time.time() - entry.stored_at < ttl):
+            metrics.fetch_cache.inc(host=host, result="hit")
+            return json.loads(entry.body)
+
+    req_headers = dict(headers or {})
+    if entry is not None:
+        if entry.etag:
+            req_headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            req_headers["If-Modified-Since"] = entry.last_modified
+
+    resp = get(url, timeout=timeout, params=params, headers=req_headers)
+    if resp.status_code == 304 and entry is not None:
+        metrics.fetch_cache.inc(host=host, result="revalidated")
+        cache.revalidated(key, version)
+        return json.loads(entry.body)
+    metrics.fetch_cache.inc(host=host, result="miss")
+    resp.raise_for_status()
+    data = resp.json()
+    cache.store(key, url, resp.content, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), version)
+    return data
+
+
+class RunMemo:
+    """Per-run memo that also coalesces concurrent calls for the same key.
+
+    One ``collect_all`` run shares a memo across countries, so responses that
+    are not country-specific (e.g. Discourse topics) are fetched only once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: Dict[Hashable, Future] = {}
+
+    def get(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            fut = self._futures.get(key)
+            owner = fut is None
+            if owner:
+                fut = Future()
+                self._futures[key] = fut
+        if owner:
+            try:
+                fut.set_result(fn())
+            except BaseException as e:
+                fut.set_exception(e)
+        return fut.result()
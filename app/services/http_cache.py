@@ -0,0 +1,132 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+from app.config import settings
+
+
+class CacheEntry(NamedTuple):
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    version: Optional[str]
+    stored_at: float
+
+
+class HttpCache:
+    """Persistent response cache (SQLite) with TTL freshness and LRU size eviction.
+
+    Entries keep the validators (ETag / Last-Modified) needed for conditional
+    revalidation, plus an optional caller-supplied ``version`` (e.g. Discourse
+    ``bumped_at``) that lets callers skip a request entirely when unchanged.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                version TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        # API keys are credentials, not part of the resource identity
+        items = sorted((k, str(v)) for k, v in (params or {}).items() if k != "key")
+        raw = url + "?" + "&".join(f"{k}={v}" for k, v in items)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, version, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return CacheEntry(*row)
+
+    def store(
+        self,
+        key: str,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        version: Optional[str] = None,
+    ):
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, etag, last_modified, version, body, len(body), now, now),
+            )
+            self._total += len(body) - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def revalidated(self, key: str, version: Optional[str] = None):
+        """Mark an entry fresh again after a 304 Not Modified."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET stored_at = ?, version = COALESCE(?, version) WHERE key = ?",
+                (time.time(), version, key),
+            )
+
+    def get_value(self, key: str, ttl: float) -> Optional[Any]:
+        """Derived-value lookup (e.g. computed Trends metrics) younger than ``ttl``."""
+        entry = self.lookup(key)
+        if entry is None or time.time() - entry.stored_at >= ttl:
+            return None
+        return json.loads(entry.body)
+
+    def put_value(self, key: str, value: Any):
+        self.store(key, key, json.dumps(value).encode("utf-8"))
+
+    def _evict(self):
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall()
+        doomed = []
+        for key, size in rows:
+            if self._total <= target:
+                break
+            doomed.append((key,))
+            self._total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+
+_cache: Optional[HttpCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[HttpCache]:
+    """Shared cache instance, or None when HTTP_CACHE_FILE is empty (cache disabled)."""
+    global _cache
+    if not settings.HTTP_CACHE_FILE:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = HttpCache(settings.HTTP_CACHE_FILE, int(settings.HTTP_CACHE_MAX_MB * 1024 * 1024))
+    return _cache
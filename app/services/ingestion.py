@@ -1,61 +1,187 @@
 from __future__ import annotations
+import threading
 import time
-from typing import Dict, List, Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Any, Optional, Sequence, Tuple
 
 import requests
 
 from app.config import settings
+from app.services import http, normalization, pipeline
+from app.services.http_cache import get_cache
+from app.services.ratelimit import AdaptiveRateLimiter, QuotaBudget, backoff_delay
+from app.utils import metrics
 from app.utils.scoring import compute_popularity
 
 
 PLATFORMS = ("YouTube", "Forum", "Google")
-COUNTRIES = ("US", "IN")
+COUNTRIES = settings.COUNTRIES
 
 
 
 # --- Real API calls (best-effort, optional for POC) ---
 
-def fetch_youtube(country: str, query: str = "n8n workflow", max_results: int = 50) -> List[Dict[str, Any]]:
-    print(f"[YouTube] Fetching up to {max_results} videos for query '{query}' in {country}...")
+YOUTUBE_SEARCH_COST = 100  # quota units per search.list page
+YOUTUBE_VIDEOS_COST = 1  # quota units per videos.list call
+YOUTUBE_PAGE_SIZE = 50  # max results per search page and max ids per videos.list call
+
+
+def youtube_queries() -> List[str]:
+    """YOUTUBE_QUERIES, or "n8n workflow" plus every TRENDS_KEYWORDS entry (case-insensitive dedupe)."""
+    raw = settings.YOUTUBE_QUERIES or ",".join(["n8n workflow", settings.TRENDS_KEYWORDS])
+    seen: set = set()
+    queries: List[str] = []
+    for q in (q.strip() for q in raw.split(",")):
+        if q and q.lower() not in seen:
+            seen.add(q.lower())
+            queries.append(q)
+    return queries
+
+
+class YouTubeRun:
+    """Quota budget and video details shared by the per-country harvests of one run.
+
+    The budget is split evenly across ``countries`` up front, so concurrently
+    running harvests cannot starve each other (or countries still waiting
+    for a fetch worker). Statistics are global, so a video found by several
+    queries or countries is requested from ``videos.list`` once per run.
+    """
+
+    def __init__(self, budget: Optional[int] = None, countries: Optional[Sequence[str]] = None):
+        self.units = settings.YOUTUBE_QUOTA_BUDGET if budget is None else budget
+        self.countries = tuple(COUNTRIES if countries is None else countries)
+        self._lock = threading.Lock()
+        self._budgets: Dict[str, QuotaBudget] = {}
+        self._videos: Dict[str, Future] = {}
+
+    def budget(self, country: str) -> QuotaBudget:
+        """This country's share of the run budget."""
+        with self._lock:
+            budget = self._budgets.get(country)
+            if budget is None:
+                budget = self._budgets[country] = QuotaBudget(self.units // max(1, len(self.countries)))
+            return budget
+
+    @property
+    def spent(self) -> int:
+        with self._lock:
+            return sum(b.spent for b in self._budgets.values())
+
+    def videos(self, ids: List[str], fetch_batch: Callable[[List[str]], Dict[str, dict]]) -> List[dict]:
+        """Details for ``ids`` (in order), fetching unseen ids in batches of 50."""
+        futures: List[Future] = []
+        new: List[str] = []
+        with self._lock:
+            for vid in ids:
+                fut = self._videos.get(vid)
+                if fut is None:
+                    fut = self._videos[vid] = Future()
+                    new.append(vid)
+                futures.append(fut)
+        for batch in _chunks(new, YOUTUBE_PAGE_SIZE):
+            found: Dict[str, dict] = {}
+            try:
+                found = fetch_batch(batch)
+            except Exception as e:
+                print(f"[YouTube] ERROR fetching details: {e}")
+            finally:
+                for vid in batch:
+                    self._videos[vid].set_result(found.get(vid))
+        return [v for v in (f.result() for f in futures) if v]
+
+
+def iter_youtube(
+    country: str,
+    queries: Optional[List[str]] = None,
+    max_pages: Optional[int] = None,
+    memo: Optional[http.RunMemo] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Videos matching ``queries`` in ``country``, yielded per videos.list batch."""
+    queries = youtube_queries() if queries is None else queries
+    max_pages = settings.YOUTUBE_MAX_PAGES if max_pages is None else max_pages
+    print(f"[YouTube] Harvesting {len(queries)} queries x up to {max_pages} pages in {country}...")
     if not settings.YOUTUBE_API_KEY:
         print("[YouTube] Skipping: YOUTUBE_API_KEY is not set.")
-        return []
+        return
+
+    # One budget and details cache across the countries of a collect_all run
+    memo = memo or http.RunMemo()
+    run: YouTubeRun = memo.get(("youtube-run",), YouTubeRun)
+    budget = run.budget(country)
+    page_cost = YOUTUBE_SEARCH_COST + YOUTUBE_VIDEOS_COST
+    if len(queries) * page_cost > budget.units:
+        print(
+            f"[YouTube] WARNING: {len(queries)} queries x {len(run.countries)} countries x {page_cost} units "
+            f"exceeds YOUTUBE_QUOTA_BUDGET={run.units}; only {budget.units // page_cost} queries get a first "
+            f"page in {country}."
+        )
 
-    search_url = "https://www.googleapis.com/youtube/v3/search"
-    videos_url = "https://www.googleapis.com/youtube/v3/videos"
+    base = settings.YOUTUBE_API_BASE.rstrip("/")
+    search_url = f"{base}/search"
+    videos_url = f"{base}/videos"
 
-    try:
+    def search_page(query: str, token: Optional[str]) -> Dict[str, Any]:
         params = {
-            "part": "snippet",
+            "part": "id",
             "q": query,
             "type": "video",
-            "maxResults": max_results,
+            "maxResults": YOUTUBE_PAGE_SIZE,
             "regionCode": country,
             "key": settings.YOUTUBE_API_KEY,
         }
-        s = requests.get(search_url, params=params, timeout=15)
-        s.raise_for_status()
-        items = s.json().get("items", [])
-        video_ids = ",".join(i["id"]["videoId"] for i in items if i.get("id", {}).get("videoId"))
-        if not video_ids:
-            print("[YouTube] No video IDs found from search.")
-            return []
-
-        print(f"[YouTube] Found {len(video_ids.split(','))} video IDs. Fetching details...")
-        p2 = {"part": "statistics,snippet", "id": video_ids, "key": settings.YOUTUBE_API_KEY}
-        v = requests.get(videos_url, params=p2, timeout=15)
-        v.raise_for_status()
-        vids = v.json().get("items", [])
-    except Exception as e:
-        print(f"[YouTube] ERROR: {e}")
-        return []
-
-    results: List[Dict[str, Any]] = []
-    for vid in vids:
-        sn = vid.get("snippet", {})
-        st = vid.get("statistics", {})
-        results.append(
-            {
+        if token:
+            params["pageToken"] = token
+        metrics.youtube_quota.inc(YOUTUBE_SEARCH_COST, call="search")
+        return http.get_json(search_url, params=params, timeout=settings.YOUTUBE_TIMEOUT) or {}
+
+    def fetch_batch(ids: List[str]) -> Dict[str, dict]:
+        params = {"part": "statistics,snippet", "id": ",".join(ids), "key": settings.YOUTUBE_API_KEY}
+        metrics.youtube_quota.inc(YOUTUBE_VIDEOS_COST, call="videos")
+        data = http.get_json(videos_url, params=params, timeout=settings.YOUTUBE_TIMEOUT) or {}
+        return {v.get("id"): v for v in data.get("items", [])}
+
+    # Breadth-first over queries (page 1 of every query, then page 2, ...) so
+    # the country's share covers every query's first page before paging deeper.
+    # Each page reserves the details call its (at most 50) new ids can need.
+    video_ids: Dict[str, None] = {}
+    tokens: Dict[str, Optional[str]] = {q: None for q in queries}
+    pages = 0
+    for _ in range(max_pages):
+        for query in list(tokens):
+            if not budget.try_spend(page_cost):
+                print(f"[YouTube] Quota budget exhausted ({budget.spent}/{budget.units} units) in {country}.")
+                tokens.clear()
+                break
+            try:
+                data = search_page(query, tokens[query])
+            except Exception as e:
+                print(f"[YouTube] ERROR searching '{query}': {e}")
+                del tokens[query]
+                continue
+            pages += 1
+            for i in data.get("items", []):
+                vid = (i.get("id") or {}).get("videoId")
+                if vid:
+                    video_ids.setdefault(vid)
+            tokens[query] = data.get("nextPageToken")
+            if not tokens[query]:
+                del tokens[query]
+        if not tokens:
+            break
+
+    if not video_ids:
+        print(f"[YouTube] No video IDs found from {pages} search pages in {country}.")
+        return
+
+    print(f"[YouTube] Found {len(video_ids)} unique video IDs in {pages} pages for {country}. Fetching details...")
+    count = 0
+    for chunk in _chunks(list(video_ids), YOUTUBE_PAGE_SIZE):
+        for vid in run.videos(chunk, fetch_batch):
+            sn = vid.get("snippet", {})
+            st = vid.get("statistics", {})
+            count += 1
+            yield {
                 "workflow": sn.get("title", "n8n workflow"),
                 "platform": "YouTube",
                 "popularity_metrics": {
@@ -67,13 +193,25 @@ def fetch_youtube(country: str, query: str = "n8n workflow", max_results: int =
                 "source_url": f"https://www.youtube.com/watch?v={vid.get('id')}",
                 "source_metadata": {"video_id": vid.get("id")},
             }
-        )
-    print(f"[YouTube] Successfully processed {len(results)} videos for {country}.")
-    return results
+    print(f"[YouTube] Successfully processed {count} videos for {country}.")
+
 
+def fetch_youtube(country: str, **kwargs) -> List[Dict[str, Any]]:
+    return list(iter_youtube(country, **kwargs))
 
-def fetch_forum(country: str, max_topics: int = 40, detail_limit: int = 20) -> List[Dict[str, Any]]:
+
+def iter_forum(
+    country: str,
+    max_topics: Optional[int] = None,
+    detail_limit: Optional[int] = None,
+    memo: Optional[http.RunMemo] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Latest and weekly-top forum topics, yielded in listing order as details arrive."""
     print(f"[Forum] Fetching topics for {country} from {settings.DISCOURSE_BASE_URL}...")
+    max_topics = settings.FORUM_MAX_TOPICS if max_topics is None else max_topics
+    detail_limit = settings.FORUM_DETAIL_LIMIT if detail_limit is None else detail_limit
+    # Discourse data is not country-specific: share fetches across countries in a run
+    memo = memo or http.RunMemo()
 
     base = settings.DISCOURSE_BASE_URL.rstrip("/")
     headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) n8n-popularity-bot"}
@@ -81,9 +219,8 @@ def fetch_forum(country: str, max_topics: int = 40, detail_limit: int = 20) -> L
     def get_topics(path: str) -> List[dict]:
         try:
             print(f"[Forum] Getting {base}{path}")
-            resp = requests.get(f"{base}{path}", headers=headers, timeout=20)
-            resp.raise_for_status()
-            data = resp.json() or {}
+            # Listings are the change signal for topic details, so always revalidate them
+            data = http.get_json(f"{base}{path}", headers=headers, timeout=settings.FORUM_TIMEOUT, ttl=0) or {}
             topic_list = (data.get("topic_list", {}) or {}).get("topics", []) or data.get("topics", [])
             print(f"[Forum] Found {len(topic_list)} topics from {path}")
             return topic_list
@@ -91,32 +228,32 @@ def fetch_forum(country: str, max_topics: int = 40, detail_limit: int = 20) -> L
             print(f"[Forum] ERROR fetching {path}: {e}")
             return []
 
-    latest = get_topics("/latest.json?order=created")
-    top_week = get_topics("/top/weekly.json")
+    def get_detail(tid: int, version: Optional[str]) -> Optional[dict]:
+        # Unchanged topics (same bumped_at/last_posted_at) are served from the cache
+        try:
+            return http.get_json(f"{base}/t/{tid}.json", headers=headers, timeout=settings.FORUM_TIMEOUT, version=version) or {}
+        except Exception:
+            return None
+
+    latest = memo.get(("forum-list", base, "/latest.json?order=created"), lambda: get_topics("/latest.json?order=created"))
+    top_week = memo.get(("forum-list", base, "/top/weekly.json"), lambda: get_topics("/top/weekly.json"))
     combined: dict[int, dict] = {t["id"]: t for t in (latest + top_week) if isinstance(t, dict) and t.get("id")}
 
     topics = list(combined.values())[:max_topics]
     print(f"[Forum] Combined to {len(topics)} unique topics. Fetching details for {min(len(topics), detail_limit)}...")
 
-    details_cache: dict[int, dict] = {}
-    for t in topics[:detail_limit]:
-        tid = t.get("id")
-        try:
-            d = requests.get(f"{base}/t/{tid}.json", headers=headers, timeout=20)
-            if d.ok:
-                details_cache[tid] = d.json() or {}
-        except Exception:
-            continue
-
-    results: List[Dict[str, Any]] = []
-    for t in topics:
-        tid = t.get("id")
-        det = details_cache.get(tid, {})
-        details_data = det.get("details", {}) or {}
-        participants = details_data.get("participants") or details_data.get("posters") or []
-
-        results.append(
-            {
+    wanted = [(t.get("id"), t.get("bumped_at") or t.get("last_posted_at")) for t in topics[:detail_limit]]
+    workers = max(1, min(settings.FORUM_DETAIL_CONCURRENCY, len(wanted) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="forum-detail") as pool:
+        # pool.map returns details in listing order, so topics stream out as they resolve
+        details = pool.map(lambda w: memo.get(("forum-topic", base, w[0]), lambda: get_detail(w[0], w[1])), wanted)
+        for i, t in enumerate(topics):
+            tid = t.get("id")
+            det = (next(details) if i < len(wanted) else None) or {}
+            details_data = det.get("details", {}) or {}
+            participants = details_data.get("participants") or details_data.get("posters") or []
+
+            yield {
                 "workflow": t.get("title", "n8n workflow discussion"),
                 "platform": "Forum",
                 "popularity_metrics": {
@@ -129,109 +266,475 @@ def fetch_forum(country: str, max_topics: int = 40, detail_limit: int = 20) -> L
                 "source_url": f"{base}/t/{tid}",
                 "source_metadata": {"topic_id": tid},
             }
+    print(f"[Forum] Successfully processed {len(topics)} topics for {country}.")
+
+
+def fetch_forum(country: str, **kwargs) -> List[Dict[str, Any]]:
+    return list(iter_forum(country, **kwargs))
+
+
+_trends_limiter: Optional[AdaptiveRateLimiter] = None
+
+# Per-source report of the latest collect_all run: seconds, items, error
+last_sources: Dict[str, Dict[str, Any]] = {}
+
+# pytrends keeps its own session, so its requests are timed here rather than in http.get
+TRENDS_HOST = "trends.google.com"
+
+# Recent per-group Trends timings: country, keywords, seconds, attempts, ok
+trends_group_latencies: Deque[Dict[str, Any]] = deque(maxlen=200)
+
+
+def trends_limiter() -> AdaptiveRateLimiter:
+    """Process-wide limiter so the learned Trends rate carries across countries and runs."""
+    global _trends_limiter
+    if _trends_limiter is None:
+        _trends_limiter = AdaptiveRateLimiter(
+            rate=settings.TRENDS_RATE, min_rate=settings.TRENDS_MIN_RATE, max_rate=settings.TRENDS_MAX_RATE
         )
-    print(f"[Forum] Successfully processed {len(results)} topics for {country}.")
-    return results
+    return _trends_limiter
 
 
-def fetch_trends(country: str, keywords: List[str]) -> List[Dict[str, Any]]:
-    print(f"[Trends] Fetching {len(keywords)} keywords for {country}...")
-    try:
-        from pytrends.request import TrendReq
-        import pandas as pd  # noqa: F401
-    except Exception:
-        print("[Trends] ERROR: pytrends or pandas is not installed.")
-        return []
+def _is_rate_limited(e: Exception) -> bool:
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    return status == 429 or type(e).__name__ == "TooManyRequestsError"
+
+
+def _trends_call(fn: Callable[[], Any]) -> Tuple[Any, int]:
+    """Run one pytrends request under the adaptive limiter, retrying 429s.
+
+    Retries use jittered exponential backoff (TRENDS_RETRIES, TRENDS_BACKOFF).
+    Returns (result, attempts); non-throttle errors propagate immediately.
+    """
+    limiter = trends_limiter()
+    attempt = 0
+    while True:
+        limiter.acquire()
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            metrics.fetch_seconds.observe(time.perf_counter() - start, host=TRENDS_HOST)
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            metrics.fetch_requests.inc(host=TRENDS_HOST, status=str(status) if status else type(e).__name__)
+            if not _is_rate_limited(e) or attempt >= settings.TRENDS_RETRIES:
+                raise
+            limiter.on_throttle()
+            metrics.fetch_retries.inc(source="trends")
+            metrics.trends_rate.set(limiter.rate)
+            delay = backoff_delay(attempt, settings.TRENDS_BACKOFF)
+            print(f"[Trends] Rate limited; retrying in {delay:.1f}s (rate now {limiter.rate:.2f}/s)")
+            time.sleep(delay)
+            attempt += 1
+            continue
+        metrics.fetch_seconds.observe(time.perf_counter() - start, host=TRENDS_HOST)
+        metrics.fetch_requests.inc(host=TRENDS_HOST, status="200")
+        limiter.on_success()
+        metrics.trends_rate.set(limiter.rate)
+        return result, attempt + 1
+
+
+def _series_metrics(series) -> Tuple[float, float]:
+    """(interest_score, trend_30d_change) from a Trends interest-over-time series."""
+    win = 14 if len(series) >= 14 else len(series)
+    interest_score = float(series.tail(win).mean()) if win > 0 else 0.0
+
+    if len(series) >= 60:
+        last30 = float(series.tail(30).mean())
+        prev30 = float(series.tail(60).head(30).mean())
+        change = ((last30 - prev30) / prev30) if prev30 != 0 else 0.0
+    else:
+        change = 0.0
+    return interest_score, change
+
+
+def _trends_entry(
+    kw: str, country: str, timeframe: str, interest_score: float, change: float, geo_mode: str = "per_country"
+) -> Dict[str, Any]:
+    entry = {
+        "workflow": kw,
+        "platform": "Google",
+        "popularity_metrics": {"interest_score": round(interest_score, 2), "trend_30d_change": round(change, 4)},
+        "country": country,
+        "source_url": f"https://trends.google.com/trends/explore?date={requests.utils.quote(timeframe)}&q={requests.utils.quote(kw)}&geo={country}",
+        "source_metadata": {"keyword": kw, "timeframe": timeframe},
+    }
+    if geo_mode != "per_country":
+        entry["source_metadata"]["geo_mode"] = geo_mode
+    metrics, score = compute_popularity("Google", dict(entry["popularity_metrics"]))
+    entry["popularity_metrics"] = metrics
+    entry["popularity_score"] = score
+    return entry
+
+
+def _trends_cache_key(kw: str, geo: str, timeframe: str, geo_mode: str) -> str:
+    # Region-mode values are shares across regions, not per-country interest
+    return f"trends:{geo_mode}:{kw}:{geo}:{timeframe}"
+
+
+def _cached_trends(kw: str, geo: str, timeframe: str, geo_mode: str = "per_country") -> Optional[List[float]]:
+    cache = get_cache()
+    return cache.get_value(_trends_cache_key(kw, geo, timeframe, geo_mode), settings.TRENDS_CACHE_TTL) if cache else None
+
+
+def _cache_trends(
+    kw: str, geo: str, timeframe: str, interest_score: float, change: float, geo_mode: str = "per_country"
+):
+    cache = get_cache()
+    if cache:
+        cache.put_value(_trends_cache_key(kw, geo, timeframe, geo_mode), [interest_score, change])
 
-    def chunks(lst: List[str], n: int):
-        for i in range(0, len(lst), n):
-            yield lst[i : i + n]
+
+def _trends_client():
+    from pytrends.request import TrendReq
 
     proxies = {"http": settings.TRENDS_PROXY_HTTP, "https": settings.TRENDS_PROXY_HTTPS}
     req_args = {
         "headers": {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"},
         "proxies": {k: v for k, v in proxies.items() if v},
-        "timeout": (10, 25),
     }
+    # pytrends passes its own timeout= on every request, so it must not be in
+    # requests_args (the duplicate keyword makes its cookie bootstrap spin forever).
+    # Retries are handled by _trends_call, not pytrends' urllib3 adapter.
+    client, _ = _trends_call(
+        lambda: TrendReq(
+            hl="en-US",
+            tz=0,
+            timeout=(10, settings.TRENDS_TIMEOUT),
+            retries=0,
+            backoff_factor=0,
+            requests_args=req_args,
+        )
+    )
+    return client
+
+
+def _chunks(lst: List[str], n: int):
+    for i in range(0, len(lst), n):
+        yield lst[i : i + n]
 
-    results: List[Dict[str, Any]] = []
-    timeframes = ["today 12-m"]  # Reduced to single timeframe to avoid rate limits
 
-    for group in chunks([k.strip() for k in keywords if k and k.strip()], 3):  # Reduced batch size to 3
+def fetch_trends(country: str, keywords: List[str]) -> List[Dict[str, Any]]:
+    print(f"[Trends] Fetching {len(keywords)} keywords for {country}...")
+    try:
+        from pytrends.request import TrendReq  # noqa: F401
+        import pandas as pd  # noqa: F401
+    except Exception:
+        print("[Trends] ERROR: pytrends or pandas is not installed.")
+        return []
+
+    timeframe = "today 12-m"  # Single timeframe to limit request volume
+    keywords = [k.strip() for k in keywords if k and k.strip()]
+    metrics: Dict[str, Tuple[float, float]] = {}
+    for kw in keywords:
+        cached = _cached_trends(kw, country, timeframe)
+        if cached is not None:
+            metrics[kw] = (cached[0], cached[1])
+    pending = [kw for kw in keywords if kw not in metrics]
+    if len(pending) < len(keywords):
+        print(f"[Trends] {len(keywords) - len(pending)} keywords served from cache for {country}.")
+
+    if pending:
+        try:
+            # One client (and session) for every group of this country
+            pytrends = _trends_client()
+        except Exception as e:
+            print(f"[Trends] ERROR creating client: {e}")
+            pending = []
+
+    for group in _chunks(pending, settings.TRENDS_GROUP_SIZE):
         print(f"[Trends] Processing group: {', '.join(group)}")
+        start = time.perf_counter()
+        attempts = 0
+        ok = False
         try:
-            # Create new instance per group to avoid session issues
-            pytrends = TrendReq(
-                hl="en-US", tz=0, retries=1, backoff_factor=0.5, requests_args=req_args
-            )
-            time.sleep(2)  # Wait before request
-            
-            pytrends.build_payload(group, timeframe=timeframes[0], geo=country)
-            df = pytrends.interest_over_time()
-            
+            _, a1 = _trends_call(lambda: pytrends.build_payload(group, timeframe=timeframe, geo=country))
+            df, a2 = _trends_call(pytrends.interest_over_time)
+            attempts = a1 + a2
+
             if df is not None and not df.empty:
                 for kw in [c for c in group if c in df.columns]:
-                    series = df[kw]
-                    win = 14 if len(series) >= 14 else len(series)
-                    interest_score = float(series.tail(win).mean()) if win > 0 else 0.0
-
-                    if len(series) >= 60:
-                        last30 = float(series.tail(30).mean())
-                        prev30 = float(series.tail(60).head(30).mean())
-                        change = ((last30 - prev30) / prev30) if prev30 != 0 else 0.0
-                    else:
-                        change = 0.0
-
-                    entry = {
-                        "workflow": kw,
-                        "platform": "Google",
-                        "popularity_metrics": {"interest_score": round(interest_score, 2), "trend_30d_change": round(change, 4)},
-                        "country": country,
-                        "source_url": f"https://trends.google.com/trends/explore?date={requests.utils.quote(timeframes[0])}&q={requests.utils.quote(kw)}&geo={country}",
-                        "source_metadata": {"keyword": kw, "timeframe": timeframes[0]},
-                    }
-                    metrics, score = compute_popularity("Google", dict(entry["popularity_metrics"]))
-                    entry["popularity_metrics"] = metrics
-                    entry["popularity_score"] = score
-                    results.append(entry)
+                    metrics[kw] = _series_metrics(df[kw])
+                    _cache_trends(kw, country, timeframe, *metrics[kw])
                 print(f"[Trends] Successfully processed group: {', '.join(group)}")
             else:
                 print(f"[Trends] No data returned for group: {', '.join(group)}")
+            ok = True
         except Exception as e:
-            print(f"[Trends] ERROR processing group: {e}")
             # Continue to next group instead of failing completely
-            continue
-        
-        # Longer delay between groups to avoid rate-limiting
-        print("[Trends] Pausing for 8 seconds to avoid rate-limiting...")
-        time.sleep(8)
-    
+            print(f"[Trends] ERROR processing group: {e}")
+        finally:
+            elapsed = time.perf_counter() - start
+            trends_group_latencies.append(
+                {"country": country, "keywords": list(group), "seconds": round(elapsed, 3), "attempts": attempts, "ok": ok}
+            )
+            print(f"[Trends] Group took {elapsed:.2f}s")
+
+    results = [_trends_entry(kw, country, timeframe, *metrics[kw]) for kw in keywords if kw in metrics]
     print(f"[Trends] Successfully processed {len(results)} keywords for {country}.")
     return results
 
 
+def fetch_trends_regions(countries: List[str], keywords: List[str]) -> List[Dict[str, Any]]:
+    """Trends for many geos at a fixed request cost per keyword group.
+
+    Each group costs one worldwide ``interest_over_time`` (for the 30-day
+    change, shared by every geo) plus one ``interest_by_region`` at country
+    resolution (for per-geo interest), so adding a country adds no requests.
+    Results are ordered by country, then keyword.
+    """
+    print(f"[Trends] Fetching {len(keywords)} keywords for {len(countries)} countries (region mode)...")
+    try:
+        from pytrends.request import TrendReq  # noqa: F401
+        import pandas as pd  # noqa: F401
+    except Exception:
+        print("[Trends] ERROR: pytrends or pandas is not installed.")
+        return []
+
+    timeframe = "today 12-m"
+    keywords = [k.strip() for k in keywords if k and k.strip()]
+    metrics: Dict[Tuple[str, str], Tuple[float, float]] = {}
+    for kw in keywords:
+        for country in countries:
+            cached = _cached_trends(kw, country, timeframe, geo_mode="region")
+            if cached is not None:
+                metrics[(kw, country)] = (cached[0], cached[1])
+    pending = [kw for kw in keywords if any((kw, c) not in metrics for c in countries)]
+
+    if pending:
+        try:
+            pytrends = _trends_client()
+        except Exception as e:
+            print(f"[Trends] ERROR creating client: {e}")
+            pending = []
+
+    for group in _chunks(pending, settings.TRENDS_GROUP_SIZE):
+        print(f"[Trends] Processing group (all geos): {', '.join(group)}")
+        start = time.perf_counter()
+        attempts = 0
+        ok = False
+        try:
+            _, a1 = _trends_call(lambda: pytrends.build_payload(group, timeframe=timeframe, geo=""))
+            df, a2 = _trends_call(pytrends.interest_over_time)
+            regions, a3 = _trends_call(
+                lambda: pytrends.interest_by_region(resolution="COUNTRY", inc_low_vol=True, inc_geo_code=True)
+            )
+            attempts = a1 + a2 + a3
+
+            by_code = regions.set_index("geoCode") if regions is not None and "geoCode" in regions.columns else None
+            for kw in group:
+                change = _series_metrics(df[kw])[1] if df is not None and kw in df.columns else 0.0
+                for country in countries:
+                    interest = 0.0
+                    if by_code is not None and kw in by_code.columns and country in by_code.index:
+                        interest = float(by_code.at[country, kw])
+                    metrics[(kw, country)] = (interest, change)
+                    _cache_trends(kw, country, timeframe, interest, change, geo_mode="region")
+            ok = True
+            print(f"[Trends] Successfully processed group: {', '.join(group)}")
+        except Exception as e:
+            print(f"[Trends] ERROR processing group: {e}")
+        finally:
+            elapsed = time.perf_counter() - start
+            trends_group_latencies.append(
+                {"country": "*", "keywords": list(group), "seconds": round(elapsed, 3), "attempts": attempts, "ok": ok}
+            )
+            print(f"[Trends] Group took {elapsed:.2f}s")
+
+    results = [
+        _trends_entry(kw, country, timeframe, *metrics[(kw, country)], geo_mode="region")
+        for country in countries
+        for kw in keywords
+        if (kw, country) in metrics
+    ]
+    print(f"[Trends] Successfully processed {len(results)} keyword/country pairs.")
+    return results
+
+
+def trends_region_mode(countries) -> bool:
+    mode = settings.TRENDS_GEO_MODE
+    if mode == "region":
+        return True
+    if mode == "per_country":
+        return False
+    return len(countries) >= settings.TRENDS_REGION_MIN_COUNTRIES
+
+
 # --- Aggregation ---
 
-def collect_all() -> List[Dict[str, Any]]:
-    print("\n--- Starting Data Ingestion (real data) ---")
-    items: List[Dict[str, Any]] = []
+def _report_source(name: str, items: int, seconds: float, error: Optional[str]):
+    metrics.source_seconds.observe(seconds, source=name)
+    metrics.source_items.set(items, source=name)
+    last_sources[name] = {"seconds": round(seconds, 3), "items": items, "error": error}
+
+
+def _trends_task(country: str, keywords: List[str]) -> List[Dict[str, Any]]:
+    # pytrends keeps its own session; serialize Trends across countries instead.
+    with http.host_slot("trends.google.com"):
+        return fetch_trends(country, keywords)
+
+
+def _trends_regions_task(countries: List[str], keywords: List[str]) -> List[Dict[str, Any]]:
+    with http.host_slot("trends.google.com"):
+        return fetch_trends_regions(countries, keywords)
+
+
+def _keywords() -> List[str]:
+    return [k for k in settings.TRENDS_KEYWORDS.split(",") if k.strip()]
+
+
+def source_tasks(memo: http.RunMemo, keywords: List[str]) -> List[pipeline.Source]:
+    """One (name, iterable factory) per (platform, country) source of a run.
 
+    In Trends region mode a single "Google/*" source covers every country.
+    """
+    region_mode = trends_region_mode(COUNTRIES)
+    tasks: List[pipeline.Source] = []
     for country in COUNTRIES:
-        print(f"\n--- Processing Country: {country} ---")
-        items.extend(fetch_youtube(country))
-        items.extend(fetch_forum(country))
-        keywords = [k for k in settings.TRENDS_KEYWORDS.split(",") if k.strip()]
-        items.extend(fetch_trends(country, keywords))
-
-    print(f"\n--- Ingestion Complete: Total items fetched: {len(items)} ---")
-
-    enriched: List[Dict[str, Any]] = []
-    for it in items:
-        if it.get("popularity_score") is None:
-            metrics, score = compute_popularity(it["platform"], dict(it["popularity_metrics"]))
-            it["popularity_metrics"] = metrics
-            it["popularity_score"] = score
-        enriched.append(it)
-
-    print(f"--- Enrichment Complete: Total items processed: {len(enriched)} ---")
-    return enriched
+        tasks.append((f"YouTube/{country}", lambda c=country: iter_youtube(c, memo=memo)))
+        tasks.append((f"Forum/{country}", lambda c=country: iter_forum(c, memo=memo)))
+        if not region_mode:
+            tasks.append((f"Google/{country}", lambda c=country: _trends_task(c, keywords)))
+    if region_mode:
+        tasks.append(("Google/*", lambda: _trends_regions_task(list(COUNTRIES), keywords)))
+    return tasks
+
+
+def score_item(it: Dict[str, Any]) -> Dict[str, Any]:
+    if it.get("popularity_score") is None:
+        metrics, score = compute_popularity(it["platform"], dict(it["popularity_metrics"]))
+        it["popularity_metrics"] = metrics
+        it["popularity_score"] = score
+    return it
+
+
+def _ordered(rows: Iterable[pipeline.Row]) -> List[Dict[str, Any]]:
+    """Items in the serial path's order: country, then platform, then source order."""
+    country_rank = {c: i for i, c in enumerate(COUNTRIES)}
+    platform_rank = {p: i for i, p in enumerate(PLATFORMS)}
+    keyed = [
+        ((country_rank[it["country"]], platform_rank[it["platform"]], seq), it)
+        for _, seq, it in rows
+        if it.get("country") in country_rank and it.get("platform") in platform_rank
+    ]
+    keyed.sort(key=lambda k: k[0])
+    return [it for _, it in keyed]
+
+
+class _Sink:
+    """Forwards pipeline output to ``write`` and reports each finished source.
+
+    With quantile normalization the rows also feed this run's sketches.
+    """
+
+    def __init__(self, write, total: int, done: int, progress, checkpoint=None):
+        self._write = write
+        self._total = total
+        self._done = done
+        self._progress = progress or (lambda done, total, name: None)
+        self._checkpoint = checkpoint
+        self.sketches = normalization.RunSketches() if normalization.enabled() else None
+
+    def write(self, rows: List[pipeline.Row]):
+        if self.sketches is not None:
+            for _, _, it in rows:
+                self.sketches.add(it)
+        self._write(rows)
+
+    def source_done(self, source: str, items: int, seconds: float, error: Optional[str]):
+        if self._checkpoint is not None:
+            self._checkpoint(source, items, error)
+        _report_source(source, items, seconds, error)
+        self._done += 1
+        self._progress(self._done, self._total, source)
+
+
+def _run_pipeline(tasks: List[pipeline.Source], sink: _Sink, workers: int):
+    pipeline.run(
+        tasks,
+        sink,
+        transform=score_item,
+        workers=workers,
+        queue_size=settings.INGEST_QUEUE_SIZE,
+        batch_size=settings.INGEST_BATCH_SIZE,
+    )
+
+
+def collect_all(
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch every (platform, country) source and score the results.
+
+    Sources stream through ``pipeline.run`` on ``INGEST_WORKERS`` fetch threads
+    (``max_workers=1`` runs them one at a time). The result is ordered as the
+    serial per-country loop, so it does not depend on completion order.
+    ``progress(done, total, source)`` is called as each source finishes.
+    """
+    workers = settings.INGEST_WORKERS if max_workers is None else max_workers
+    print(f"\n--- Starting Data Ingestion (real data, {workers} workers) ---")
+    last_sources.clear()
+    tasks = source_tasks(http.RunMemo(), _keywords())
+    out = pipeline.ListSink()
+    sink = _Sink(out.write, len(tasks), 0, progress)
+    _run_pipeline(tasks, sink, workers)
+    items = _ordered(out.rows)
+    print(f"\n--- Ingestion Complete: Total items fetched and scored: {len(items)} ---")
+    if sink.sketches is not None:
+        normalization.normalize(items, sink.sketches)
+    return items
+
+
+def collect_staged(
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+) -> Tuple[List[Dict[str, Any]], str]:
+    """``collect_all`` through the durable staging store, resuming an interrupted run.
+
+    Scored items are committed to staging in batches and each source is
+    checkpointed once complete, so only unfinished sources are fetched again
+    after a crash. Returns the items and the staging run id; call
+    ``staging.finish(run_id)`` once they are published.
+    """
+    from app.store import staging
+
+    workers = settings.INGEST_WORKERS if max_workers is None else max_workers
+    keywords = _keywords()
+    config = staging.config_digest(
+        COUNTRIES,
+        keywords,
+        youtube_queries(),
+        settings.YOUTUBE_MAX_PAGES,
+        settings.FORUM_MAX_TOPICS,
+        settings.FORUM_DETAIL_LIMIT,
+        trends_region_mode(COUNTRIES),
+    )
+    run_id, done = staging.open_run(config)
+    last_sources.clear()
+    tasks = source_tasks(http.RunMemo(), keywords)
+    pending = [(name, fn) for name, fn in tasks if name not in done]
+    if done:
+        print(f"[Ingest] Resuming run {run_id[:8]}: {len(done)} of {len(tasks)} sources already staged.")
+        for name, info in done.items():
+            last_sources[name] = {"seconds": 0.0, "items": info["items"], "error": None, "resumed": True}
+    print(f"\n--- Starting Data Ingestion (real data, {workers} workers, staged) ---")
+    sink = _Sink(
+        lambda rows: staging.write(run_id, rows),
+        len(tasks),
+        len(tasks) - len(pending),
+        progress,
+        checkpoint=lambda name, items, error: staging.source_done(run_id, name, items, error),
+    )
+    _run_pipeline(pending, sink, workers)
+    rows = staging.load(run_id)
+    if sink.sketches is not None:
+        # Sources staged by the interrupted run never streamed through this sink
+        for source, _, it in rows:
+            if source in done:
+                sink.sketches.add(it)
+    items = _ordered(rows)
+    del rows
+    print(f"\n--- Ingestion Complete: Total items fetched and scored: {len(items)} ---")
+    if sink.sketches is not None:
+        normalization.normalize(items, sink.sketches)
+    return items, run_id
@@ -0,0 +1,172 @@
+from __future__ import annotations
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.sched.leader import FileLock
+from app.services.entities import resolve_entities
+from app.services.momentum import apply_momentum, save_state
+from app.store import history
+from app.store.repository import save_all
+from app.utils import metrics
+
+
+MAX_JOBS = 20  # finished jobs kept for status polling
+
+_lock = threading.Lock()
+_jobs: "OrderedDict[str, RefreshJob]" = OrderedDict()
+_active: Optional["RefreshJob"] = None
+# Held while ingesting so workers in other processes never refresh concurrently
+_ingest_lock = FileLock(settings.INGEST_LOCK_FILE)
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+class RefreshJob:
+    def __init__(self, trigger: str):
+        self.id = uuid.uuid4().hex
+        self.trigger = trigger
+        self.status = "queued"
+        self.created_at = _now()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.duration_s: Optional[float] = None
+        self.count: Optional[int] = None
+        self.error: Optional[str] = None
+        self.progress: Dict[str, Any] = {"done": 0, "total": 0, "last": None}
+        # Per-stage and per-source timings/item counts of this run
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.sources: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def report_progress(self, done: int, total: int, last: str):
+        self.progress = {"done": done, "total": total, "last": last}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "trigger": self.trigger,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_s": self.duration_s,
+            "count": self.count,
+            "error": self.error,
+            "progress": dict(self.progress),
+            "stages": dict(self.stages),
+            "sources": dict(self.sources),
+        }
+
+
+def _claim(trigger: str) -> Tuple["RefreshJob", bool]:
+    """Register a new job unless one is already active (single-flight)."""
+    global _active
+    with _lock:
+        if _active is not None and _active.active:
+            return _active, False
+        job = RefreshJob(trigger)
+        _active = job
+        _jobs[job.id] = job
+        while len(_jobs) > MAX_JOBS:
+            _jobs.popitem(last=False)
+        return job, True
+
+
+def _stage(job: RefreshJob, name: str, fn: Callable[[], Any], items: Optional[List[Dict[str, Any]]] = None) -> Any:
+    """Run one pipeline stage, recording its duration and output size."""
+    with metrics.stage_seconds.time(stage=name) as timer:
+        result = fn()
+    count = len(result if items is None else items)
+    metrics.stage_items.set(count, stage=name)
+    job.stages[name] = {"seconds": round(timer.seconds, 3), "items": count}
+    return result
+
+
+def _run(job: RefreshJob):
+    job.started_at = _now()
+    start = time.perf_counter()
+    if not _ingest_lock.acquire():
+        print(f"[Refresh] Skipping job {job.id}: another process is refreshing.")
+        job.status = "skipped"
+        job.error = "another process is refreshing"
+        job.finished_at = _now()
+        job.duration_s = 0.0
+        metrics.refresh_total.inc(status=job.status)
+        return
+    job.status = "running"
+    try:
+        # Deferred so API workers never pay for requests/pytrends at boot
+        from app.services import ingestion
+        from app.store import staging
+
+        staged: Dict[str, Any] = {}
+
+        def collect() -> List[Dict[str, Any]]:
+            items, staged["run_id"] = ingestion.collect_staged(progress=job.report_progress)
+            return items
+
+        items = _stage(job, "collect", collect)
+        job.sources = dict(ingestion.last_sources)
+        momentum_state = _stage(job, "momentum", lambda: apply_momentum(items), items)
+        _stage(job, "entities", lambda: resolve_entities(items), items)
+        _stage(job, "save", lambda: save_all(items), items)
+        save_state(momentum_state)
+        # Published: drop the staged run (a failure above leaves it to resume from;
+        # history below only records the save, so a failure there must not resume it)
+        staging.finish(staged["run_id"])
+        _stage(job, "history", lambda: history.append_snapshot(items), items)
+        job.count = len(items)
+        job.status = "succeeded"
+    except Exception as e:
+        print(f"[Refresh] ERROR in job {job.id}: {e}")
+        job.error = str(e)
+        job.status = "failed"
+    finally:
+        _ingest_lock.release()
+        job.duration_s = round(time.perf_counter() - start, 3)
+        job.finished_at = _now()
+        metrics.refresh_seconds.observe(job.duration_s, status=job.status)
+        metrics.refresh_total.inc(status=job.status)
+        if job.status == "succeeded":
+            metrics.refresh_last_success.set(time.time())
+
+
+def submit_refresh(trigger: str = "api") -> Tuple[RefreshJob, bool]:
+    """Start a refresh in a background thread.
+
+    Returns the job and whether it was newly created; if a refresh is already
+    running (from the API, startup or the scheduler) that job is returned.
+    """
+    job, created = _claim(trigger)
+    if created:
+        threading.Thread(target=_run, args=(job,), name=f"refresh-{job.id[:8]}", daemon=True).start()
+    return job, created
+
+
+def run_refresh(trigger: str = "scheduler") -> Optional[RefreshJob]:
+    """Run a refresh in the calling thread; skipped if another one is in flight."""
+    job, created = _claim(trigger)
+    if not created:
+        print(f"[Refresh] Skipping {trigger} refresh: job {job.id} is already {job.status}.")
+        return None
+    _run(job)
+    return job
+
+
+def get_job(job_id: str) -> Optional[RefreshJob]:
+    return _jobs.get(job_id)
+
+
+def latest_job() -> Optional[RefreshJob]:
+    with _lock:
+        return next(reversed(_jobs.values()), None)
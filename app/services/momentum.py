@@ -0,0 +1,84 @@
+from __future__ import annotations
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.services import normalization
+from app.store.repository import atomic_write_json, item_key
+from app.utils.scoring import compute_popularity, momentum_score
+
+
+# Counters tracked per platform; each yields a "<name>_per_day" metric.
+RATE_FIELDS = {
+    "YouTube": ("views", "likes", "comments"),
+    "Forum": ("views", "likes", "replies"),
+}
+DAY = 86_400.0
+
+
+def _load_state() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(settings.MOMENTUM_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_state(state: Dict[str, Dict[str, Any]]):
+    """Persist the state returned by apply_momentum (once the items it scored are saved)."""
+    try:
+        atomic_write_json(settings.MOMENTUM_FILE, state)
+    except OSError as e:
+        print(f"[Momentum] WARNING: could not persist state: {e}")
+
+
+def apply_momentum(items: List[Dict[str, Any]], now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+    """Add per-day growth rates and ``momentum_score`` to items in place.
+
+    Keeps O(1) state per item (last counters, timestamp and an exponentially
+    weighted moving average of each rate) in MOMENTUM_FILE, so each refresh
+    only compares against the previous one instead of rescanning history.
+    With SCORE_MODE=momentum, popularity_score is re-blended with momentum.
+
+    Returns the new state without writing it: pass it to save_state after the
+    items are saved, so a failed refresh doesn't advance the baseline.
+    """
+    now = time.time() if now is None else now
+    alpha = settings.MOMENTUM_ALPHA
+    blend = settings.SCORE_MODE == "momentum"
+    old_state = _load_state()
+    new_state: Dict[str, Dict[str, Any]] = {}
+
+    for it in items:
+        item_id = it.setdefault("id", item_key(it))
+        platform = it.get("platform")
+        metrics = it.get("popularity_metrics") or {}
+        fields = RATE_FIELDS.get(platform, ())
+        if item_id and fields:
+            prev = old_state.get(item_id)
+            counts = {f: float(metrics.get(f, 0)) for f in fields}
+            ewma: Dict[str, float] = dict(prev.get("ewma", {})) if prev else {}
+            days = (now - float(prev["ts"])) / DAY if prev else 0.0
+            # Ignore same-day reruns: too short an interval to say anything about growth
+            if prev and days >= settings.MOMENTUM_MIN_DAYS:
+                for f in fields:
+                    rate = (counts[f] - float(prev["counts"].get(f, 0))) / days
+                    key = f"{f}_per_day"
+                    ewma[key] = rate if key not in ewma else alpha * rate + (1 - alpha) * ewma[key]
+                new_state[item_id] = {"ts": now, "counts": counts, "ewma": ewma}
+            else:
+                new_state[item_id] = prev or {"ts": now, "counts": counts, "ewma": ewma}
+            for key, value in ewma.items():
+                metrics[key] = round(value, 4)
+
+        it["momentum_score"] = momentum_score(platform, metrics)
+        if blend:
+            scale = normalization.scale_for(platform, it.get("country"))
+            metrics, score = compute_popularity(platform, dict(metrics), momentum=True, scale=scale)
+            it["popularity_metrics"] = metrics
+            it["popularity_score"] = score
+
+    # Items that dropped out of the sources are forgotten, keeping state O(items)
+    return new_state
@@ -0,0 +1,123 @@
+"""Percentile-rank score normalization (SCORE_NORMALIZATION=quantile).
+
+Every refresh streams each metric into a KLL sketch per platform, country and
+metric. The sketches of the last SKETCH_RUNS refreshes are persisted in
+SKETCH_FILE and merged, and a value scores by its percentile rank in that
+distribution instead of against a fixed cap. Memory per metric is bounded
+by the sketch size, not the dataset size, and the dataset is never sorted.
+"""
+from __future__ import annotations
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.store.repository import atomic_write_json
+from app.utils.scoring import QUANTILE_METRICS, Scale, compute_popularity
+from app.utils.sketch import KLLSketch, Ranker
+
+# Merged sketches by "<platform>/<country>/<metric>" (None until first use)
+_rankers: Optional[Dict[str, Ranker]] = None
+
+
+def enabled() -> bool:
+    return settings.SCORE_NORMALIZATION == "quantile"
+
+
+class RunSketches:
+    """Sketches of one refresh, fed item by item as the pipeline streams."""
+
+    def __init__(self, k: Optional[int] = None):
+        self.k = settings.SKETCH_K if k is None else k
+        self.sketches: Dict[str, KLLSketch] = {}
+
+    def add(self, it: Dict[str, Any]):
+        platform = it.get("platform")
+        metrics = it.get("popularity_metrics") or {}
+        for name in QUANTILE_METRICS.get(platform, ()):
+            value = metrics.get(name)
+            if isinstance(value, (int, float)):
+                key = f"{platform}/{it.get('country')}/{name}"
+                sketch = self.sketches.get(key)
+                if sketch is None:
+                    sketch = self.sketches[key] = KLLSketch(self.k)
+                sketch.update(float(value))
+
+
+def _load_runs() -> List[Dict[str, Any]]:
+    try:
+        with open(settings.SKETCH_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+    runs = data.get("runs") if isinstance(data, dict) else None
+    return runs if isinstance(runs, list) else []
+
+
+def merge_runs(runs: Iterable[Dict[str, Any]]) -> Dict[str, KLLSketch]:
+    """Merge persisted runs (from this node's SKETCH_FILE or several nodes') per key."""
+    merged: Dict[str, KLLSketch] = {}
+    for run in runs:
+        for key, data in (run.get("sketches") or {}).items():
+            sketch = KLLSketch.from_dict(data)
+            if key in merged:
+                merged[key].merge(sketch)
+            else:
+                merged[key] = sketch
+    return merged
+
+
+def _set_rankers(runs: List[Dict[str, Any]]) -> Dict[str, Ranker]:
+    global _rankers
+    _rankers = {key: sketch.ranker() for key, sketch in merge_runs(runs).items()}
+    return _rankers
+
+
+def rankers() -> Dict[str, Ranker]:
+    """Merged sketches of the persisted runs, loaded once per process."""
+    current = _rankers
+    return current if current is not None else _set_rankers(_load_runs())
+
+
+def record_run(run: RunSketches, now: Optional[float] = None) -> Dict[str, Ranker]:
+    """Persist ``run`` next to the previous SKETCH_RUNS - 1 runs and refresh the rankers."""
+    entry = {"ts": time.time() if now is None else now, "sketches": {k: s.to_dict() for k, s in run.sketches.items()}}
+    runs = (_load_runs() + [entry])[-max(1, settings.SKETCH_RUNS):]
+    try:
+        atomic_write_json(settings.SKETCH_FILE, {"runs": runs})
+    except OSError as e:
+        print(f"[Normalize] WARNING: could not persist sketches: {e}")
+    return _set_rankers(runs)
+
+
+def scale_for(platform: str, country: Optional[str]) -> Optional[Scale]:
+    """Percentile-rank scale for one platform/country, or None with caps normalization."""
+    if not enabled():
+        return None
+    table = rankers()
+    prefix = f"{platform}/{country}/"
+
+    def scale(name: str, value: float) -> Optional[float]:
+        ranker = table.get(prefix + name)
+        return ranker.percentile(value) if ranker is not None else None
+
+    return scale
+
+
+def normalize(items: List[Dict[str, Any]], run: RunSketches) -> None:
+    """Record the run's sketches and re-score ``items`` in place by percentile rank.
+
+    Metrics without a sketch (none of the last SKETCH_RUNS runs saw them for
+    that platform/country) keep their fixed cap.
+    """
+    record_run(run)
+    scales: Dict[Tuple[str, Any], Optional[Scale]] = {}
+    for it in items:
+        platform = it["platform"]
+        group = (platform, it.get("country"))
+        if group not in scales:
+            scales[group] = scale_for(*group)
+        metrics, score = compute_popularity(platform, dict(it["popularity_metrics"]), scale=scales[group])
+        it["popularity_metrics"] = metrics
+        it["popularity_score"] = score
+    print(f"[Normalize] Scored {len(items)} items by percentile rank across {len(run.sketches)} sketches.")
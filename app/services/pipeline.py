@@ -0,0 +1,156 @@
+"""Streaming fetch -> transform -> write pipeline with bounded queues.
+
+Sources are generators run on a thread pool; items flow through a bounded
+queue to a single transform thread, which groups them into batches on a
+second bounded queue drained by the writer (the calling thread). Full queues
+block the stages upstream, so at most about ``queue_size + 2 * batch_size``
+items are in flight no matter how large the sources are.
+
+The sink sees every batch of a source before that source's ``source_done``,
+so a sink that checkpoints there never records a source as finished with
+items still in flight.
+"""
+from __future__ import annotations
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+Item = Dict[str, Any]
+Source = Tuple[str, Callable[[], Iterable[Item]]]
+Row = Tuple[str, int, Item]  # (source, seq within the source, item)
+
+_END = object()
+_POLL_S = 0.2
+
+
+class Sink(Protocol):
+    def write(self, rows: List[Row]) -> None: ...
+
+    def source_done(self, source: str, items: int, seconds: float, error: Optional[str]) -> None: ...
+
+
+class ListSink:
+    """Collects rows in memory (``collect_all``'s list-returning path)."""
+
+    def __init__(self):
+        self.rows: List[Row] = []
+
+    def write(self, rows: List[Row]):
+        self.rows.extend(rows)
+
+    def source_done(self, source: str, items: int, seconds: float, error: Optional[str]):
+        pass
+
+
+class _Stopped(Exception):
+    pass
+
+
+def run(
+    sources: Sequence[Source],
+    sink: Sink,
+    transform: Callable[[Item], Item] = lambda it: it,
+    workers: int = 4,
+    queue_size: int = 1000,
+    batch_size: int = 500,
+):
+    """Drain every source into ``sink``; raises the first transform/sink error."""
+    if not sources:
+        return
+    items_q: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+    batches_q: "queue.Queue" = queue.Queue(maxsize=2)
+    stop = threading.Event()
+    failure: List[BaseException] = []
+
+    def put(q: "queue.Queue", value: Any):
+        # Blocking put that gives up once the pipeline is stopping
+        while True:
+            try:
+                q.put(value, timeout=_POLL_S)
+                return
+            except queue.Full:
+                if stop.is_set():
+                    raise _Stopped()
+
+    def fetch(name: str, factory: Callable[[], Iterable[Item]]):
+        start = time.perf_counter()
+        count = 0
+        error = None
+        try:
+            for item in factory():
+                put(items_q, (name, count, item))
+                count += 1
+        except _Stopped:
+            return
+        except Exception as e:
+            print(f"[Pipeline] ERROR in {name}: {e}")
+            error = str(e)
+        try:
+            put(items_q, (name, _END, (count, time.perf_counter() - start, error)))
+        except _Stopped:
+            pass
+
+    def transform_stage():
+        pending: Dict[str, List[Row]] = {}
+        buffered = 0
+        remaining = len(sources)
+        try:
+            while remaining:
+                try:
+                    name, seq, payload = items_q.get(timeout=_POLL_S)
+                except queue.Empty:
+                    if stop.is_set():
+                        return
+                    continue
+                if seq is _END:
+                    # Flush the source before announcing it is done
+                    rows = pending.pop(name, [])
+                    buffered -= len(rows)
+                    if rows:
+                        put(batches_q, ("rows", rows))
+                    put(batches_q, ("done", name, payload))
+                    remaining -= 1
+                    continue
+                pending.setdefault(name, []).append((name, seq, transform(payload)))
+                buffered += 1
+                if buffered >= batch_size:
+                    for rows in pending.values():
+                        put(batches_q, ("rows", rows))
+                    pending.clear()
+                    buffered = 0
+            put(batches_q, None)
+        except _Stopped:
+            return
+        except BaseException as e:
+            failure.append(e)
+            stop.set()
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="pipeline-fetch")
+    transformer = threading.Thread(target=transform_stage, name="pipeline-transform", daemon=True)
+    transformer.start()
+    try:
+        for name, factory in sources:
+            pool.submit(fetch, name, factory)
+        while not stop.is_set():
+            try:
+                msg = batches_q.get(timeout=_POLL_S)
+            except queue.Empty:
+                continue
+            if msg is None:
+                break
+            if msg[0] == "rows":
+                sink.write(msg[1])
+            else:
+                _, name, (count, seconds, error) = msg
+                sink.source_done(name, count, seconds, error)
+    except BaseException as e:
+        failure.append(e)
+        raise
+    finally:
+        stop.set()
+        pool.shutdown(wait=True)
+        transformer.join()
+    if failure:
+        raise failure[0]
@@ -0,0 +1,86 @@
+from __future__ import annotations
+import random
+import threading
+import time
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate adapts with AIMD.
+
+    Each success adds ``increase`` requests/second to the rate (up to
+    ``max_rate``); each throttle response multiplies it by ``decrease`` (down
+    to ``min_rate``) and empties the bucket. Callers therefore run as fast as
+    the remote side currently allows instead of sleeping a fixed time.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        burst: float = 1.0,
+        increase: float = 0.05,
+        decrease: float = 0.5,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                delay = (1.0 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = 0.0
+            self._last = time.monotonic()
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 60.0) -> float:
+    """Exponential backoff with full jitter for retry ``attempt`` (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class QuotaBudget:
+    """Thread-safe pool of API quota units for one run; spending never goes negative."""
+
+    def __init__(self, units: int):
+        self.units = units
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        return self.units - self.spent
+
+    def try_spend(self, cost: int) -> bool:
+        with self._lock:
+            if self.spent + cost > self.units:
+                return False
+            self.spent += cost
+            return True
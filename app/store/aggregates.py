@@ -0,0 +1,76 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Sequence
+
+HISTOGRAM_BINS = 10
+TOP_N = 10
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Linear-interpolated percentile of an ascending list (q in [0, 100])."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def _histogram(values: List[float], bins: int) -> List[int]:
+    counts = [0] * bins
+    for v in values:
+        counts[min(bins - 1, max(0, int(v * bins)))] += 1
+    return counts
+
+
+def _slim(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": item.get("id"),
+        "workflow": item.get("workflow"),
+        "platform": item.get("platform"),
+        "popularity_score": item.get("popularity_score"),
+        "source_url": item.get("source_url"),
+    }
+
+
+def compute_stats(items: Sequence[Dict[str, Any]], updated_at: str, top_n: int = TOP_N, bins: int = HISTOGRAM_BINS) -> Dict[str, Any]:
+    """Aggregates served by GET /stats, computed once per dataset version."""
+    by_platform: Dict[str, int] = {}
+    by_country: Dict[str, int] = {}
+    scores_by_platform: Dict[str, List[float]] = {}
+    by_country_items: Dict[str, List[Dict[str, Any]]] = {}
+    for it in items:
+        platform = it.get("platform", "Unknown")
+        country = it.get("country", "Unknown")
+        by_platform[platform] = by_platform.get(platform, 0) + 1
+        by_country[country] = by_country.get(country, 0) + 1
+        score = it.get("popularity_score")
+        if isinstance(score, (int, float)):
+            scores_by_platform.setdefault(platform, []).append(float(score))
+            by_country_items.setdefault(country, []).append(it)
+
+    score_summary: Dict[str, Dict[str, float]] = {}
+    score_histogram: Dict[str, List[int]] = {}
+    for platform, scores in scores_by_platform.items():
+        scores.sort()
+        score_summary[platform] = {
+            "count": len(scores),
+            "mean": round(sum(scores) / len(scores), 6),
+            "p50": round(_percentile(scores, 50), 6),
+            "p95": round(_percentile(scores, 95), 6),
+        }
+        score_histogram[platform] = _histogram(scores, bins)
+
+    top_by_country = {
+        country: [_slim(it) for it in sorted(group, key=lambda x: float(x["popularity_score"]), reverse=True)[:top_n]]
+        for country, group in by_country_items.items()
+    }
+
+    return {
+        "updated_at": updated_at,
+        "by_platform": by_platform,
+        "by_country": by_country,
+        "total": len(items),
+        "score_summary": score_summary,
+        "score_histogram": {"edges": [round(i / bins, 6) for i in range(bins + 1)], "counts": score_histogram},
+        "top_by_country": top_by_country,
+    }
@@ -0,0 +1,39 @@
+from __future__ import annotations
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from app.store import serialize
+
+CHUNK_BYTES = 64 * 1024
+
+
+def iter_ndjson(
+    items: Iterable[Dict[str, Any]],
+    chunk_bytes: int = CHUNK_BYTES,
+    encode: Optional[Callable[[Dict[str, Any]], bytes]] = None,
+) -> Iterator[bytes]:
+    """Serialize items as NDJSON, yielding ~chunk_bytes blocks.
+
+    Memory stays bounded by one chunk regardless of how many items are exported.
+    ``encode`` lets callers supply pre-serialized items (Snapshot.item_json).
+    """
+    encode = encode or serialize.dumps
+    buf = bytearray()
+    for it in items:
+        buf += encode(it)
+        buf += b"\n"
+        if len(buf) >= chunk_bytes:
+            yield bytes(buf)
+            buf.clear()
+    if buf:
+        yield bytes(buf)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Incrementally gzip a byte stream."""
+    comp = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        out = comp.compress(chunk)
+        if out:
+            yield out
+    yield comp.flush()
@@ -0,0 +1,218 @@
+"""Append-only history of popularity snapshots, one columnar partition per day.
+
+Layout under HISTORY_DIR::
+
+    2025-01-31/
+        CURRENT        name of the live version directory
+        v<ns>/
+            ids.txt    item ids, sorted, one per line
+            ids.idx    uint64 byte offset of every line in ids.txt
+            views.f64  float64 per row (NaN when the item lacks the metric)
+            ...        one file per column in COLUMNS
+            meta.json
+
+A rerun on the same day writes a new version directory and then atomically
+replaces CURRENT, so readers always find a complete partition; superseded
+versions are removed on a later write once VERSION_GRACE_S has passed. Partitions
+written before versioning (files directly in the day directory) are still read.
+
+Rows are in sorted-id order, so an item is found by binary search over the
+memory-mapped id files and each requested value is one 8-byte read. Queries
+touch only the partitions in range (after downsampling) and the columns asked
+for, so their cost does not grow with the length of the history.
+"""
+from __future__ import annotations
+import json
+import math
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import time
+from array import array
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from app.config import settings
+
+
+COLUMNS = (
+    "popularity_score",
+    "views",
+    "likes",
+    "comments",
+    "replies",
+    "contributors",
+    "interest_score",
+    "trend_30d_change",
+    "monthly_search_volume",
+)
+DOWNSAMPLE = ("day", "week", "month")
+VERSION_GRACE_S = 300.0
+
+
+def _value(item: Dict[str, Any], column: str) -> float:
+    raw = item.get(column) if column == "popularity_score" else (item.get("popularity_metrics") or {}).get(column)
+    try:
+        return float(raw) if raw is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def append_snapshot(items: Iterable[Dict[str, Any]], day: Optional[date] = None) -> str:
+    """Write ``items`` as the partition for ``day`` (default: today, UTC).
+
+    A later run on the same day replaces that day's partition.
+    Returns the partition directory.
+    """
+    day = day or datetime.utcnow().date()
+    rows = sorted(((str(it.get("id")), it) for it in items if it.get("id")), key=lambda r: r[0])
+
+    day_dir = os.path.join(settings.HISTORY_DIR, day.isoformat())
+    # Leftovers of the earlier rename-based swap
+    for stale in (day_dir + ".tmp", day_dir + ".old"):
+        shutil.rmtree(stale, ignore_errors=True)
+    version = f"v{time.time_ns()}"
+    tmp = os.path.join(day_dir, version)
+    os.makedirs(tmp)
+
+    offsets = array("Q")
+    with open(os.path.join(tmp, "ids.txt"), "wb") as f:
+        pos = 0
+        for item_id, _ in rows:
+            line = item_id.encode("utf-8") + b"\n"
+            offsets.append(pos)
+            f.write(line)
+            pos += len(line)
+    with open(os.path.join(tmp, "ids.idx"), "wb") as f:
+        offsets.tofile(f)
+    for column in COLUMNS:
+        with open(os.path.join(tmp, f"{column}.f64"), "wb") as f:
+            array("d", (_value(it, column) for _, it in rows)).tofile(f)
+    with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"date": day.isoformat(), "rows": len(rows), "columns": list(COLUMNS)}, f)
+
+    # Publish by replacing the pointer; readers see either the old or the new version
+    fd, pointer = tempfile.mkstemp(prefix=".CURRENT-", dir=day_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(day_dir, "CURRENT"))
+    _prune_versions(day_dir, version)
+    print(f"[History] Wrote {len(rows)} rows to partition {day.isoformat()}")
+    return tmp
+
+
+def _prune_versions(day_dir: str, current: str):
+    # Superseded versions live on for VERSION_GRACE_S so readers that resolved
+    # CURRENT just before the switch can finish
+    cutoff = time.time_ns() - int(VERSION_GRACE_S * 1e9)
+    for name in os.listdir(day_dir):
+        if name.startswith("v") and name != current and name[1:].isdigit() and int(name[1:]) < cutoff:
+            shutil.rmtree(os.path.join(day_dir, name), ignore_errors=True)
+    # Files of a pre-versioning partition are superseded by CURRENT, as are
+    # pointer temp files left by an interrupted run
+    for name in os.listdir(day_dir):
+        path = os.path.join(day_dir, name)
+        legacy = name.endswith(".f64") or name in ("ids.txt", "ids.idx", "meta.json")
+        if os.path.isfile(path) and (legacy or name.startswith(".CURRENT-")):
+            os.remove(path)
+
+
+def _partition_dir(day: str) -> str:
+    day_dir = os.path.join(settings.HISTORY_DIR, day)
+    try:
+        with open(os.path.join(day_dir, "CURRENT"), "r", encoding="utf-8") as f:
+            return os.path.join(day_dir, f.read().strip())
+    except FileNotFoundError:
+        return day_dir  # written before versioning
+
+
+def partitions(start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+    """Partition dates (ISO strings, ascending) within [start, end]."""
+    try:
+        names = os.listdir(settings.HISTORY_DIR)
+    except FileNotFoundError:
+        return []
+    days = sorted(n for n in names if len(n) == 10 and n[4] == "-" and n[7] == "-")
+    return [d for d in days if (start is None or d >= start) and (end is None or d <= end)]
+
+
+def _bucket(day: str, every: str) -> str:
+    if every == "month":
+        return day[:7]
+    if every == "week":
+        iso = date.fromisoformat(day).isocalendar()
+        return f"{iso[0]}-W{iso[1]:02d}"
+    return day
+
+
+def downsample(days: Sequence[str], every: str) -> List[str]:
+    """Keep the last partition of each day/week/month bucket."""
+    last: Dict[str, str] = {}
+    for d in days:
+        last[_bucket(d, every)] = d
+    return sorted(last.values())
+
+
+def _find_row(pdir: str, item_id: str) -> Optional[int]:
+    key = item_id.encode("utf-8")
+    try:
+        with open(os.path.join(pdir, "ids.idx"), "rb") as fi, open(os.path.join(pdir, "ids.txt"), "rb") as ft:
+            if os.fstat(fi.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(fi.fileno(), 0, access=mmap.ACCESS_READ) as mi, mmap.mmap(
+                ft.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mt:
+                offsets = memoryview(mi).cast("Q")
+                try:
+                    lo, hi = 0, len(offsets)
+                    while lo < hi:
+                        mid = (lo + hi) // 2
+                        start = offsets[mid]
+                        line = mt[start : mt.find(b"\n", start)]
+                        if line < key:
+                            lo = mid + 1
+                        elif line > key:
+                            hi = mid
+                        else:
+                            return mid
+                    return None
+                finally:
+                    offsets.release()
+    except FileNotFoundError:
+        return None
+
+
+def _read_value(pdir: str, column: str, row: int) -> Optional[float]:
+    try:
+        with open(os.path.join(pdir, f"{column}.f64"), "rb") as f:
+            f.seek(row * 8)
+            raw = f.read(8)
+    except FileNotFoundError:
+        return None
+    if len(raw) != 8:
+        return None
+    (value,) = struct.unpack("=d", raw)
+    return None if math.isnan(value) else value
+
+
+def query(
+    item_id: str,
+    columns: Sequence[str] = ("popularity_score",),
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    every: str = "day",
+) -> List[Dict[str, Any]]:
+    """Points for one item: ``[{"date": ..., <column>: value}, ...]`` in date order."""
+    points: List[Dict[str, Any]] = []
+    for day in downsample(partitions(start, end), every):
+        pdir = _partition_dir(day)
+        row = _find_row(pdir, item_id)
+        if row is None:
+            continue
+        point: Dict[str, Any] = {"date": day}
+        for column in columns:
+            point[column] = _read_value(pdir, column, row)
+        points.append(point)
+    return points
@@ -1,16 +1,221 @@
 import json
 import os
+import tempfile
+import threading
+import time
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from app.config import settings
+from app.store import serialize
+from app.store import sqlite_store
+from app.store import topk
+from app.store.aggregates import compute_stats
+from app.store.search import SearchIndex
+from app.store.sqlite_store import item_key
+from app.utils.scoring import compute_popularity
+
+
+# Sort keys whose orderings are computed eagerly when a snapshot is built.
+PRESORTED_KEYS = ("popularity_score",)
+# Set on every item a refresh scores; sortable even on an unscored dataset,
+# where missing values sort last
+SCORE_FIELDS = ("popularity_score", "momentum_score")
+
+
+def _sort_key(sort_by: str):
+    if sort_by == "popularity_score":
+        return lambda x: float(x.get("popularity_score", 0))
+    return lambda x: x.get(sort_by, 0)
+
+
+class Snapshot:
+    """Immutable, indexed view of the dataset.
+
+    Items are partitioned by (platform, country), with ``None`` standing for
+    "any", so every filter combination of GET /workflows maps to a ready list.
+    Orderings are cached per (platform, country, sort_by, reverse); the
+    popularity orderings are built up front, others on first use.
+    ``seeded`` snapshots hold SEED_FILE items standing in for an empty store.
+    """
+
+    def __init__(
+        self,
+        items: List[Dict[str, Any]],
+        signature: Optional[Tuple] = None,
+        stats: Optional[Dict[str, Any]] = None,
+        seeded: bool = False,
+    ):
+        self.items: Tuple[Dict[str, Any], ...] = tuple(items)
+        self.signature = signature
+        self.seeded = seeded
+        self.version = "seed" if seeded else version_tag(signature)
+        self.stats = stats
+        self._lock = threading.Lock()
+        self._orderings: Dict[Tuple, Tuple[Dict[str, Any], ...]] = {}
+        self.fields = frozenset(k for it in self.items for k in it)
+        self.metric_fields = frozenset(k for it in self.items for k in (it.get("popularity_metrics") or {}))
+        self._keyed: Dict[Tuple, Tuple[Tuple[topk.SortKey, Dict[str, Any]], ...]] = {}
+        self._derived: Dict[str, Any] = {}
+        self._json: Dict[int, bytes] = {}
+
+        partitions: Dict[Tuple[Optional[str], Optional[str]], List[Dict[str, Any]]] = {(None, None): list(self.items)}
+        for it in self.items:
+            p, c = it.get("platform"), it.get("country")
+            for key in ((p, None), (None, c), (p, c)):
+                partitions.setdefault(key, []).append(it)
+        self.partitions: Dict[Tuple[Optional[str], Optional[str]], Tuple[Dict[str, Any], ...]] = {
+            k: tuple(v) for k, v in partitions.items()
+        }
+
+        # One stable sort per direction, then split: a filtered stable sort is the
+        # stable sort of the subset, so every partition is ordered without re-sorting
+        for sort_by in PRESORTED_KEYS:
+            if sort_by not in self.fields:
+                continue
+            for reverse in (True, False):
+                ranked: Dict[Tuple[Optional[str], Optional[str]], List[Dict[str, Any]]] = {k: [] for k in self.partitions}
+                everything = ranked[(None, None)]
+                for it in sorted(self.items, key=_sort_key(sort_by), reverse=reverse):
+                    everything.append(it)
+                    p, c = it.get("platform"), it.get("country")
+                    for key in ((p, None), (None, c), (p, c)):
+                        ranked[key].append(it)
+                for (p, c), ordered in ranked.items():
+                    self._orderings[(p, c, sort_by, reverse)] = tuple(ordered)
+
+    def partition(self, platform: Optional[str], country: Optional[str]) -> Tuple[Dict[str, Any], ...]:
+        return self.partitions.get((platform or None, country or None), ())
+
+    def ordered(
+        self, platform: Optional[str], country: Optional[str], sort_by: str, reverse: bool
+    ) -> Tuple[Dict[str, Any], ...]:
+        key = (platform or None, country or None, sort_by, reverse)
+        cached = self._orderings.get(key)
+        if cached is not None:
+            return cached
+
+        if sort_by not in self.fields:
+            # Every key is the default 0, so the stable sort keeps partition order
+            return self.partition(platform, country)
+
+        items = list(self.partition(platform, country))
+        try:
+            items.sort(key=_sort_key(sort_by), reverse=reverse)
+        except Exception:
+            if sort_by == "popularity_score":
+                raise
+            # Fallback to popularity_score if invalid sort field
+            items = list(self.ordered(platform, country, "popularity_score", True))
+
+        ordered = tuple(items)
+        with self._lock:
+            self._orderings.setdefault(key, ordered)
+        return self._orderings[key]
+
+    def sortable(self, field: str) -> bool:
+        if field in SCORE_FIELDS:
+            return True
+        if field.startswith("popularity_metrics."):
+            return field.split(".", 1)[1] in self.metric_fields
+        return field in self.fields or field in self.metric_fields
+
+    def keyed(
+        self, platform: Optional[str], country: Optional[str], field: str, desc: bool
+    ) -> Tuple[Tuple[topk.SortKey, Dict[str, Any]], ...]:
+        """(typed sort key, item) pairs for a partition, cached per field and direction."""
+        key = (platform or None, country or None, field, desc)
+        cached = self._keyed.get(key)
+        if cached is not None:
+            return cached
+        get = topk.field_getter(field)
+        pairs = tuple(
+            # The tie-breaker must be unique or keyset paging skips items with equal values
+            (topk.typed_key(get(it), str(it.get("id") or item_key(it)), desc), it)
+            for it in self.partition(platform, country)
+        )
+        with self._lock:
+            self._keyed.setdefault(key, pairs)
+        return self._keyed[key]
+
+    def item_json(self, item: Dict[str, Any], store: bool = True) -> bytes:
+        """Serialized item, encoded once per snapshot (items are never mutated after build).
+
+        Full scans such as the export pass ``store=False`` so they reuse
+        cached bytes without pinning the whole dataset's JSON in memory.
+        """
+        data = self._json.get(id(item))
+        if data is None:
+            data = serialize.dumps(item)
+            if store:
+                self._json[id(item)] = data
+        return data
+
+    def derived(self, name: str, build: Callable[[Tuple[Dict[str, Any], ...]], Any]) -> Any:
+        """Value computed once from this snapshot's items (e.g. entity rollups)."""
+        cached = self._derived.get(name)
+        if cached is not None:
+            return cached
+        value = build(self.items)
+        with self._lock:
+            self._derived.setdefault(name, value)
+        return self._derived[name]
+
+
+def version_tag(signature: Optional[Tuple]) -> str:
+    """Dataset version as a compact string (empty dataset -> "empty")."""
+    return "-".join(str(p) for p in signature) if signature else "empty"
+
+
+_snapshot: Optional[Snapshot] = None
+_snapshot_lock = threading.Lock()
+_last_poll = 0.0
+
+
+_migrated = False
+_migrate_lock = threading.Lock()
 
 
 def ensure_dirs():
     os.makedirs(os.path.dirname(settings.DATA_FILE), exist_ok=True)
 
 
-def load_all() -> List[Dict[str, Any]]:
+def _use_sqlite() -> bool:
+    return settings.STORE_BACKEND == "sqlite"
+
+
+def _ensure_migrated():
+    """Seed an empty SQLite store from the legacy JSON data file, once per process."""
+    global _migrated
+    if _migrated:
+        return
+    with _migrate_lock:
+        if _migrated:
+            return
+        if sqlite_store.data_version() == 0:
+            items = _read_file()
+            if items:
+                print(f"[Store] Importing {len(items)} items from {settings.DATA_FILE} into {settings.DB_FILE}")
+                sqlite_store.upsert_all(items)
+        _migrated = True
+
+
+def _file_signature() -> Optional[Tuple]:
+    try:
+        st = os.stat(settings.DATA_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _signature() -> Optional[Tuple]:
+    if _use_sqlite():
+        _ensure_migrated()
+        return ("sqlite", sqlite_store.data_version())
+    return _file_signature()
+
+
+def _read_file() -> List[Dict[str, Any]]:
     ensure_dirs()
     if not os.path.exists(settings.DATA_FILE):
         return []
@@ -19,26 +224,161 @@ def load_all() -> List[Dict[str, Any]]:
             data = json.load(f)
         except json.JSONDecodeError:
             return []
-    return data if isinstance(data, list) else []
+    if not isinstance(data, list):
+        return []
+    # Files written before ids existed: fill them in so both backends return the same shape
+    for it in data:
+        it.setdefault("id", item_key(it))
+    return data
+
+
+def _seed_items() -> List[Dict[str, Any]]:
+    """SEED_FILE items scored like freshly collected ones ([] if unset or unreadable)."""
+    if not settings.SEED_FILE:
+        return []
+    try:
+        with open(settings.SEED_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[Store] WARNING: could not read seeds from {settings.SEED_FILE}: {e}")
+        return []
+    items = []
+    for it in data if isinstance(data, list) else []:
+        metrics, score = compute_popularity(it["platform"], dict(it.get("popularity_metrics") or {}))
+        items.append({**it, "popularity_metrics": metrics, "popularity_score": score, "id": item_key(it)})
+    return items
+
+
+def _read_items() -> List[Dict[str, Any]]:
+    return sqlite_store.load_items() if _use_sqlite() else _read_file()
+
+
+def atomic_write_json(path: str, obj: Any, indent: Optional[int] = None):
+    # Write to a temp file and rename over the target so readers see the old or
+    # the new file, never a partially written one.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _write_file(items: List[Dict[str, Any]]):
+    atomic_write_json(settings.DATA_FILE, items, indent=2)
+
+
+def _utc_iso(ts: Optional[float] = None) -> str:
+    dt = datetime.utcfromtimestamp(ts) if ts is not None else datetime.utcnow()
+    return dt.isoformat() + "Z"
+
+
+def _load_stats(version: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(settings.STATS_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(data, dict) or data.get("dataset_version") != version:
+        return None
+    return data.get("stats")
+
+
+def _persist_stats(version: str, stats_data: Dict[str, Any]):
+    try:
+        atomic_write_json(settings.STATS_FILE, {"dataset_version": version, "stats": stats_data})
+    except OSError as e:
+        print(f"[Store] WARNING: could not persist stats: {e}")
+
+
+def _build_snapshot(items: List[Dict[str, Any]], signature: Optional[Tuple], updated_at: Optional[str] = None) -> Snapshot:
+    if not items and updated_at is None:
+        # Nothing collected yet: serve the seeds until the first refresh saves
+        seeds = _seed_items()
+        if seeds:
+            print(f"[Store] Store is empty; serving {len(seeds)} seed items from {settings.SEED_FILE}")
+            stats_data = compute_stats(seeds, _utc_iso(os.path.getmtime(settings.SEED_FILE)))
+            stats_data["seeded"] = True
+            return Snapshot(seeds, signature, stats_data, seeded=True)
+    version = version_tag(signature)
+    stats_data = None if updated_at else _load_stats(version)
+    if stats_data is None:
+        if updated_at is None:
+            # Stats were never written for this version: date them by the data file
+            mtime = os.path.getmtime(settings.DATA_FILE) if os.path.exists(settings.DATA_FILE) else None
+            updated_at = _utc_iso(mtime)
+        stats_data = compute_stats(items, updated_at)
+        _persist_stats(version, stats_data)
+    return Snapshot(items, signature, stats_data)
+
+
+def get_snapshot() -> Snapshot:
+    """Return the current snapshot, rebuilding it if the stored data changed.
+
+    Saves in this process swap the snapshot directly; changes written by other
+    workers are noticed by polling the dataset version at most every
+    SNAPSHOT_POLL_S seconds.
+    """
+    global _snapshot, _last_poll
+    now = time.monotonic()
+    if _snapshot is not None and now - _last_poll < settings.SNAPSHOT_POLL_S:
+        return _snapshot
+    _last_poll = now
+    signature = _signature()
+    snap = _snapshot
+    if snap is not None and snap.signature == signature:
+        return snap
+
+    with _snapshot_lock:
+        signature = _signature()
+        snap = _snapshot
+        if snap is not None and snap.signature == signature:
+            return snap
+        snap = _build_snapshot(_read_items(), signature)
+        _snapshot = snap
+    return snap
+
+
+def load_all() -> List[Dict[str, Any]]:
+    return list(get_snapshot().items)
 
 
 def save_all(items: List[Dict[str, Any]]):
-    ensure_dirs()
-    with open(settings.DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(items, f, ensure_ascii=False, indent=2)
+    global _snapshot
+    for it in items:
+        it.setdefault("id", item_key(it))
+    with _snapshot_lock:
+        if _use_sqlite():
+            _ensure_migrated()
+            signature = ("sqlite", sqlite_store.upsert_all(items))
+            # Match the order other workers (and restarts) read back, so ties
+            # under one ETag sort the same everywhere
+            by_id = {it["id"]: it for it in items}
+            items = [by_id[key] for key in sqlite_store.item_ids()]
+        else:
+            _write_file(items)
+            signature = _file_signature()
+        _snapshot = _build_snapshot(items, signature, updated_at=_utc_iso())
+        snap = _snapshot
+    # Built outside the lock so readers keep being served meanwhile
+    snap.derived("search", _build_search_index)
+
+
+def _build_search_index(items: Tuple[Dict[str, Any], ...]) -> SearchIndex:
+    return SearchIndex(items, settings.SEARCH_POPULARITY_WEIGHT)
+
+
+def search_index() -> SearchIndex:
+    """Title search index of the current snapshot (built on save, else on first use)."""
+    return get_snapshot().derived("search", _build_search_index)
 
 
 def stats() -> Dict[str, Any]:
-    items = load_all()
-    by_platform: Dict[str, int] = {}
-    by_country: Dict[str, int] = {}
-    for it in items:
-        by_platform[it.get("platform", "Unknown")] = by_platform.get(it.get("platform", "Unknown"), 0) + 1
-        by_country[it.get("country", "Unknown")] = by_country.get(it.get("country", "Unknown"), 0) + 1
-
-    return {
-        "updated_at": datetime.utcnow().isoformat() + "Z",
-        "by_platform": by_platform,
-        "by_country": by_country,
-        "total": len(items),
-    }
+    """Aggregates precomputed when the dataset was saved (O(1) per request)."""
+    return get_snapshot().stats
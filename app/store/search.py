@@ -0,0 +1,306 @@
+from __future__ import annotations
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# BM25 parameters (Robertson/Sparck Jones defaults)
+K1 = 1.2
+B = 0.75
+# A prefix query term expands to at most this many vocabulary terms (highest df first)
+MAX_EXPANSIONS = 64
+# Postings a query may walk in impact order before switching to exact intersection
+WALK_BUDGET = 512
+# Query results remembered per index (the index is rebuilt with every snapshot)
+RESULT_CACHE_SIZE = 4096
+_CHUNK = 256
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except Exception as e:  # pragma: no cover - depends on environment
+        raise RuntimeError("numpy is required for the search index") from e
+    return np
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, accent-stripped tokens with a light plural stem (query and index alike)."""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode("ascii").lower()
+    out = []
+    for tok in _TOKEN_RE.findall(text):
+        if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        out.append(tok)
+    return out
+
+
+class SearchIndex:
+    """Inverted index over item titles with BM25 ranking blended with popularity.
+
+    Every term's postings are stored twice in flat arrays:
+
+    * impact-ordered, by ``bm25(term, doc) + popularity_weight * popularity_score``.
+      A query walks its rarest term from the top, checks the other terms against
+      the document's tokens and stops once no remaining posting can beat the
+      current top-k (bounded by each term's maximum BM25). Most queries finish
+      after a few dozen postings regardless of dataset size.
+    * doc-ordered, with the term's BM25 per posting. Queries whose terms rarely
+      co-occur (or never do) exhaust the walk budget and are answered by a
+      vectorized sorted-array intersection instead.
+    """
+
+    def __init__(self, items: Sequence[Dict[str, Any]], popularity_weight: float = 1.0):
+        np = _numpy()
+        self.items = items
+        self.popularity_weight = popularity_weight
+
+        docs: List[Tuple[str, ...]] = []
+        term_ids: Dict[str, int] = {}
+        p_term: List[int] = []
+        p_doc: List[int] = []
+        p_tf: List[int] = []
+        for doc, it in enumerate(items):
+            tokens = tuple(tokenize(it.get("workflow", "")))
+            docs.append(tokens)
+            for tok in set(tokens):
+                p_term.append(term_ids.setdefault(tok, len(term_ids)))
+                p_doc.append(doc)
+                p_tf.append(tokens.count(tok))
+        self._docs = docs
+        n = len(docs)
+
+        # Renumber terms in sorted order so term id ranges match vocab ranges
+        self.vocab: List[str] = sorted(term_ids)
+        remap = np.empty(len(term_ids), dtype=np.int64)
+        for tid, term in enumerate(self.vocab):
+            remap[term_ids[term]] = tid
+        self._term_id = {t: i for i, t in enumerate(self.vocab)}
+
+        term = remap[np.asarray(p_term, dtype=np.int64)] if p_term else np.empty(0, dtype=np.int64)
+        doc = np.asarray(p_doc, dtype=np.int64)
+        tf = np.asarray(p_tf, dtype=np.float64)
+        dl = np.fromiter((len(d) for d in docs), dtype=np.float64, count=n)
+        self._avgdl = float(dl.mean()) if n and dl.any() else 1.0
+        df = np.bincount(term, minlength=len(self.vocab))
+        self._idf = np.log(1 + (n - df + 0.5) / (df + 0.5))
+        bm = self._idf[term] * tf * (K1 + 1) / (tf + K1 * (1 - B + B * dl[doc] / self._avgdl))
+        self._pop = np.fromiter((float(it.get("popularity_score") or 0) for it in items), dtype=np.float64, count=n)
+        impact = bm + popularity_weight * self._pop[doc]
+
+        self._start = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+        by_doc = np.lexsort((doc, term))
+        self._doc_ids = doc[by_doc]
+        self._doc_bm = bm[by_doc]
+        by_impact = np.lexsort((doc, -impact, term))
+        self._imp_ids = doc[by_impact]
+        self._imp = impact[by_impact]
+        self._max_bm25 = np.maximum.reduceat(self._doc_bm, self._start[:-1]) if len(df) else np.empty(0)
+
+        self._platforms: Dict[Any, int] = {}
+        self._countries: Dict[Any, int] = {}
+        self._platform = np.fromiter(
+            (self._platforms.setdefault(it.get("platform"), len(self._platforms)) for it in items), dtype=np.int32, count=n
+        )
+        self._country = np.fromiter(
+            (self._countries.setdefault(it.get("country"), len(self._countries)) for it in items), dtype=np.int32, count=n
+        )
+        self._suggest_cache: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+        self._results: "OrderedDict[Tuple, List[Tuple[float, Dict[str, Any]]]]" = OrderedDict()
+        self._results_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def df(self, term: str) -> int:
+        tid = self._term_id.get(term)
+        return 0 if tid is None else int(self._start[tid + 1] - self._start[tid])
+
+    def _bm25(self, tid: int, term: str, doc: int) -> float:
+        tokens = self._docs[doc]
+        tf = tokens.count(term)
+        return float(self._idf[tid]) * tf * (K1 + 1) / (tf + K1 * (1 - B + B * len(tokens) / self._avgdl))
+
+    def _impact_postings(self, tid: int) -> Iterator[Tuple[float, int]]:
+        lo, hi = int(self._start[tid]), int(self._start[tid + 1])
+        for i in range(lo, hi, _CHUNK):
+            j = min(i + _CHUNK, hi)
+            yield from zip(self._imp[i:j].tolist(), self._imp_ids[i:j].tolist())
+
+    def _doc_postings(self, tid: int):
+        lo, hi = int(self._start[tid]), int(self._start[tid + 1])
+        return self._doc_ids[lo:hi], self._doc_bm[lo:hi]
+
+    def expand(self, prefix: str, limit: int = MAX_EXPANSIONS) -> List[str]:
+        """Vocabulary terms starting with ``prefix``, most frequent first."""
+        if not prefix:
+            return []
+        lo = bisect_left(self.vocab, prefix)
+        hi = bisect_left(self.vocab, prefix + "\x7f", lo)
+        if hi - lo > limit:
+            counts = self._start[lo + 1 : hi + 1] - self._start[lo:hi]
+            picked = [self.vocab[lo + i] for i in _numpy().argsort(-counts, kind="stable")[:limit].tolist()]
+        else:
+            picked = self.vocab[lo:hi]
+        return sorted(picked, key=lambda t: (-self.df(t), t))
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Autocomplete: completions of the last word of ``prefix`` with their document counts."""
+        words = tokenize(prefix)
+        if not words or not prefix[-1:].isalnum():
+            return []
+        key = (words[-1], limit)
+        cached = self._suggest_cache.get(key)
+        if cached is None:
+            cached = [{"term": t, "count": self.df(t)} for t in self.expand(words[-1], limit)]
+            if len(self._suggest_cache) < 10_000:
+                self._suggest_cache[key] = cached
+        return cached
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        prefix: bool = True,
+        platform: Optional[str] = None,
+        country: Optional[str] = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Top ``limit`` (score, item) pairs for items containing every query term.
+
+        With ``prefix`` the last word, unless followed by a space, also matches
+        longer terms ("sla" -> "slack"). The stemmed form is a prefix of the
+        typed one, so expanding it covers both "sheet" and "sheets".
+        """
+        words = tokenize(query)
+        if not words or limit <= 0:
+            return []
+        plat = self._platforms.get(platform, -1) if platform else None
+        ctry = self._countries.get(country, -1) if country else None
+        if plat == -1 or ctry == -1:
+            return []
+        last = words[-1] if prefix and query[-1:].isalnum() else None
+        key = (tuple(words), last, limit, plat, ctry)
+        with self._results_lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return cached
+        result = self._search(words, last, limit, plat, ctry)
+        with self._results_lock:
+            self._results[key] = result
+            if len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return result
+
+    def _search(self, words, last, limit, plat, ctry) -> List[Tuple[float, Dict[str, Any]]]:
+        exact = sorted(set(words[:-1] if last else words), key=lambda t: (self.df(t), t))
+        tids = [self._term_id.get(t) for t in exact]
+        if any(t is None for t in tids):
+            return []
+        expansions = self.expand(last) if last else []
+        if last and not expansions:
+            return []
+        exp_ids = [self._term_id[t] for t in expansions]
+
+        hits = self._walk(tids, exact, exp_ids, expansions, limit, plat, ctry)
+        if hits is None:
+            hits = self._intersect(tids, exp_ids, limit, plat, ctry)
+        return [(round(s, 6), self.items[d]) for s, d in hits]
+
+    def _accept(self, doc: int, plat: Optional[int], ctry: Optional[int]) -> bool:
+        return (plat is None or self._platform[doc] == plat) and (ctry is None or self._country[doc] == ctry)
+
+    def _walk(self, tids, exact, exp_ids, expansions, limit, plat, ctry) -> Optional[List[Tuple[float, int]]]:
+        """Impact-ordered walk with early termination; None if the budget runs out."""
+        if tids:
+            others = list(zip(tids[1:], exact[1:]))
+            stream = self._impact_postings(tids[0])
+            bound = sum(float(self._max_bm25[t]) for t in tids[1:])
+            bound += max((float(self._max_bm25[t]) for t in exp_ids), default=0.0)
+            exp_set = frozenset(expansions)
+        else:
+            # Walk all expansions together; a document's first appearance
+            # carries its best-matching expansion.
+            others = []
+            stream = heapq.merge(*(self._impact_postings(t) for t in exp_ids), key=lambda p: (-p[0], p[1]))
+            bound = 0.0
+            exp_set = frozenset()
+
+        filtered = plat is not None or ctry is not None
+        heap: List[Tuple[float, int]] = []
+        seen = set()
+        for walked, (impact, doc) in enumerate(stream):
+            if len(heap) == limit and impact + bound <= heap[0][0]:
+                break
+            if walked >= WALK_BUDGET:
+                return None
+            if doc in seen or (filtered and not self._accept(doc, plat, ctry)):
+                continue
+            seen.add(doc)
+            tokens = self._docs[doc]
+            score = impact
+            for tid, term in others:
+                if term not in tokens:
+                    break
+                score += self._bm25(tid, term, doc)
+            else:
+                if exp_set:
+                    matched = [t for t in set(tokens) if t in exp_set]
+                    if not matched:
+                        continue
+                    score += max(self._bm25(self._term_id[t], t, doc) for t in matched)
+                entry = (score, -doc)
+                if len(heap) < limit:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+        return [(s, -d) for s, d in sorted(heap, reverse=True)]
+
+    def _intersect(self, tids, exp_ids, limit, plat, ctry) -> List[Tuple[float, int]]:
+        """Exact answer from doc-ordered postings (sorted-array intersection)."""
+        np = _numpy()
+        if tids:
+            cand, score = self._doc_postings(tids[0])
+            for tid in tids[1:]:
+                ids, bm = self._doc_postings(tid)
+                pos = np.minimum(np.searchsorted(ids, cand), len(ids) - 1)
+                hit = ids[pos] == cand
+                cand, score = cand[hit], score[hit] + bm[pos[hit]]
+            if exp_ids:
+                best = np.full(len(cand), -np.inf)
+                for tid in exp_ids:
+                    ids, bm = self._doc_postings(tid)
+                    pos = np.minimum(np.searchsorted(ids, cand), len(ids) - 1)
+                    hit = ids[pos] == cand
+                    best[hit] = np.maximum(best[hit], bm[pos[hit]])
+                keep = best > -np.inf
+                cand, score = cand[keep], score[keep] + best[keep]
+        else:
+            parts = [self._doc_postings(t) for t in exp_ids]
+            ids = np.concatenate([p[0] for p in parts])
+            bm = np.concatenate([p[1] for p in parts])
+            order = np.lexsort((-bm, ids))
+            ids, bm = ids[order], bm[order]
+            first = np.ones(len(ids), dtype=bool)
+            first[1:] = ids[1:] != ids[:-1]
+            cand, score = ids[first], bm[first]
+
+        if plat is not None:
+            keep = self._platform[cand] == plat
+            cand, score = cand[keep], score[keep]
+        if ctry is not None:
+            keep = self._country[cand] == ctry
+            cand, score = cand[keep], score[keep]
+        if not len(cand):
+            return []
+        score = score + self.popularity_weight * self._pop[cand]
+        if len(cand) > limit:
+            top = np.argpartition(-score, limit - 1)[:limit]
+            cand, score = cand[top], score[top]
+        order = np.lexsort((cand, -score))
+        return list(zip(score[order].tolist(), cand[order].tolist()))
@@ -0,0 +1,75 @@
+from __future__ import annotations
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:  # optional fast path
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+
+class Raw(bytes):
+    """Already-serialized JSON, spliced verbatim by ``dump_object``."""
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON; orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass  # e.g. non-str keys; stdlib handles those
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON text or bytes; orjson when installed."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def dump_array(parts: Iterable[bytes]) -> Raw:
+    return Raw(b"[" + b",".join(parts) + b"]")
+
+
+def dump_object(pairs: Sequence[Tuple[str, Any]]) -> bytes:
+    """Serialize key/value pairs as a JSON object; ``Raw`` values are inserted as-is."""
+    return b"{" + b",".join(dumps(k) + b":" + (v if isinstance(v, Raw) else dumps(v)) for k, v in pairs) + b"}"
+
+
+class Projection:
+    """``fields=`` selector for items.
+
+    Either an include list (``workflow,platform,popularity_metrics.views``) or
+    an exclude list where every entry starts with "-"
+    (``-source_metadata,-popularity_metrics.like_to_view_ratio``).
+    """
+
+    def __init__(self, spec: str):
+        names = [f.strip() for f in spec.split(",") if f.strip()]
+        excludes = [n for n in names if n.startswith("-")]
+        if excludes and len(excludes) != len(names):
+            raise ValueError("fields must be all includes or all excludes (-name)")
+        self.exclude = bool(excludes)
+        self.top: List[str] = []
+        self.metrics: List[str] = []
+        for name in (n.lstrip("-") for n in names):
+            if name.startswith("popularity_metrics."):
+                self.metrics.append(name.split(".", 1)[1])
+            else:
+                self.top.append(name)
+
+    def __call__(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        metrics = item.get("popularity_metrics")
+        if self.exclude:
+            out = {k: v for k, v in item.items() if k not in self.top}
+            if self.metrics and isinstance(metrics, dict) and "popularity_metrics" in out:
+                out["popularity_metrics"] = {k: v for k, v in metrics.items() if k not in self.metrics}
+            return out
+        out = {k: item[k] for k in self.top if k in item}
+        if self.metrics and isinstance(metrics, dict) and "popularity_metrics" not in out:
+            out["popularity_metrics"] = {k: metrics[k] for k in self.metrics if k in metrics}
+        return out
+
+
+def parse_fields(spec: Optional[str]) -> Optional[Projection]:
+    return Projection(spec) if spec and spec.strip() else None
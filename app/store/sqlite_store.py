@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List
+
+from app.config import settings
+from app.store import serialize
+
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+
+def item_key(item: Dict[str, Any]) -> str:
+    """Stable identity of an item: platform, source ID and country."""
+    meta = item.get("source_metadata") or {}
+    for field in ("video_id", "topic_id", "keyword"):
+        if meta.get(field) not in (None, ""):
+            source_id = meta[field]
+            break
+    else:
+        source_id = item.get("source_url") or item.get("workflow", "")
+    return f"{item.get('platform')}:{source_id}:{item.get('country')}"
+
+
+def connect() -> sqlite3.Connection:
+    """Per-thread connection to DB_FILE in WAL mode, creating the schema on first use.
+
+    WAL lets readers keep reading the last committed version while a refresh
+    writes, so they never block on or observe a partial write.
+    """
+    global _schema_ready
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+
+    os.makedirs(os.path.dirname(settings.DB_FILE), exist_ok=True)
+    conn = sqlite3.connect(settings.DB_FILE, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _schema_lock:
+        if not _schema_ready:
+            with conn:
+                conn.execute(
+                    """CREATE TABLE IF NOT EXISTS items (
+                        id TEXT PRIMARY KEY,
+                        platform TEXT,
+                        country TEXT,
+                        popularity_score REAL,
+                        body TEXT NOT NULL,
+                        hash TEXT NOT NULL
+                    )"""
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS items_platform ON items (platform)")
+                conn.execute("CREATE INDEX IF NOT EXISTS items_country ON items (country)")
+                conn.execute("CREATE INDEX IF NOT EXISTS items_score ON items (popularity_score)")
+                conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+                conn.execute("INSERT OR IGNORE INTO meta VALUES ('version', 0)")
+            _schema_ready = True
+    _local.conn = conn
+    return conn
+
+
+def data_version() -> int:
+    """Monotonic dataset version, bumped by every committed upsert."""
+    row = connect().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    return int(row[0]) if row else 0
+
+
+def load_items() -> List[Dict[str, Any]]:
+    # rowid order is first-insertion order, so existing items keep their place
+    rows = connect().execute("SELECT body FROM items ORDER BY rowid")
+    loads = serialize.loads
+    return [loads(body) for (body,) in rows]
+
+
+def item_ids() -> List[str]:
+    """Ids in load_items() order, so a freshly saved snapshot matches a reload."""
+    return [key for (key,) in connect().execute("SELECT id FROM items ORDER BY rowid")]
+
+
+def upsert_all(items: List[Dict[str, Any]]) -> int:
+    """Make the table hold exactly ``items``, writing only changed rows.
+
+    Rows are matched on ``item["id"]``; unchanged rows (same content hash) are
+    skipped and ids absent from ``items`` are deleted, all in one transaction.
+    Returns the new data version.
+    """
+    conn = connect()
+    rows: Dict[str, tuple] = {}
+    for it in items:
+        body = json.dumps(it, ensure_ascii=False, separators=(",", ":"))
+        digest = hashlib.sha1(body.encode("utf-8")).hexdigest()
+        rows[it["id"]] = (it["id"], it.get("platform"), it.get("country"), it.get("popularity_score"), body, digest)
+
+    existing = dict(conn.execute("SELECT id, hash FROM items"))
+    changed = [r for key, r in rows.items() if existing.get(key) != r[5]]
+    removed = [(key,) for key in existing.keys() - rows.keys()]
+
+    with conn:
+        conn.executemany(
+            """INSERT INTO items (id, platform, country, popularity_score, body, hash)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(id) DO UPDATE SET
+                 platform = excluded.platform,
+                 country = excluded.country,
+                 popularity_score = excluded.popularity_score,
+                 body = excluded.body,
+                 hash = excluded.hash""",
+            changed,
+        )
+        conn.executemany("DELETE FROM items WHERE id = ?", removed)
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+    print(f"[Store] Upserted {len(changed)} changed rows, deleted {len(removed)}, kept {len(rows) - len(changed)}.")
+    return data_version()
@@ -0,0 +1,141 @@
+"""Durable staging area for an in-progress refresh.
+
+The ingestion pipeline commits fetched items here in batches as they arrive
+and checkpoints each source once all of its items are in. A refresh that dies
+midway (crash, deploy, OOM) resumes from those checkpoints: finished sources
+are kept, partially staged ones are discarded and fetched again.
+"""
+from __future__ import annotations
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.store import serialize
+
+# (source, seq within the source, item)
+StagedRow = Tuple[str, int, Dict[str, Any]]
+
+_local = threading.local()
+
+
+def connect() -> sqlite3.Connection:
+    """Per-thread connection to INGEST_STAGING_FILE, creating the schema on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+    os.makedirs(os.path.dirname(settings.INGEST_STAGING_FILE) or ".", exist_ok=True)
+    conn = sqlite3.connect(settings.INGEST_STAGING_FILE, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs (run_id TEXT PRIMARY KEY, config TEXT NOT NULL, started_at REAL NOT NULL)"
+        )
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS sources (
+                run_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                items INTEGER NOT NULL,
+                error TEXT,
+                PRIMARY KEY (run_id, source)
+            )"""
+        )
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS items (
+                run_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                body TEXT NOT NULL
+            )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS items_run_source ON items (run_id, source)")
+    _local.conn = conn
+    return conn
+
+
+def config_digest(*parts: Any) -> str:
+    """Fingerprint of the settings a run depends on; a run only resumes under the same config."""
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def open_run(config: str) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+    """Resume the latest unfinished run with this config, or start a new one.
+
+    Returns the run id and its finished sources ({source: {"items", "error"}});
+    sources that ended with an error are not counted as finished.
+    Runs older than INGEST_RESUME_MAX_AGE_H (or with another config) are
+    dropped rather than resumed, since their data would be stale.
+    """
+    conn = connect()
+    cutoff = time.time() - settings.INGEST_RESUME_MAX_AGE_H * 3600
+    row = conn.execute(
+        "SELECT run_id FROM runs WHERE config = ? AND started_at >= ? ORDER BY started_at DESC LIMIT 1",
+        (config, cutoff),
+    ).fetchone()
+    with conn:
+        stale = [r for (r,) in conn.execute("SELECT run_id FROM runs") if not row or r != row[0]]
+        for run_id in stale:
+            _delete(conn, run_id)
+        if row is None:
+            run_id = uuid.uuid4().hex
+            conn.execute("INSERT INTO runs VALUES (?, ?, ?)", (run_id, config, time.time()))
+            return run_id, {}
+        run_id = row[0]
+        # Sources that failed are retried rather than resumed
+        conn.execute("DELETE FROM sources WHERE run_id = ? AND error IS NOT NULL", (run_id,))
+        rows = conn.execute("SELECT source, items, error FROM sources WHERE run_id = ?", (run_id,))
+        done = {source: {"items": n, "error": error} for source, n, error in rows}
+        # Items of sources that never finished are incomplete; they are fetched again
+        conn.execute(
+            "DELETE FROM items WHERE run_id = ? AND source NOT IN (SELECT source FROM sources WHERE run_id = ?)",
+            (run_id, run_id),
+        )
+    return run_id, done
+
+
+def write(run_id: str, rows: List[StagedRow]):
+    """Commit one batch of items."""
+    conn = connect()
+    dumps = serialize.dumps
+    with conn:
+        conn.executemany(
+            "INSERT INTO items (run_id, source, seq, body) VALUES (?, ?, ?, ?)",
+            [(run_id, source, seq, dumps(item).decode("utf-8")) for source, seq, item in rows],
+        )
+
+
+def source_done(run_id: str, source: str, items: int, error: Optional[str] = None):
+    """Checkpoint ``source``: all of its items are committed."""
+    conn = connect()
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)", (run_id, source, items, error))
+
+
+def load(run_id: str) -> List[StagedRow]:
+    """Staged rows of the run (only finished sources), in source then seq order."""
+    loads = serialize.loads
+    rows = connect().execute(
+        """SELECT i.source, i.seq, i.body FROM items i
+           JOIN sources s ON s.run_id = i.run_id AND s.source = i.source
+           WHERE i.run_id = ? ORDER BY i.source, i.seq""",
+        (run_id,),
+    )
+    return [(source, seq, loads(body)) for source, seq, body in rows]
+
+
+def finish(run_id: str):
+    """Drop a run once its items are published."""
+    conn = connect()
+    with conn:
+        _delete(conn, run_id)
+
+
+def _delete(conn: sqlite3.Connection, run_id: str):
+    conn.execute("DELETE FROM items WHERE run_id = ?", (run_id,))
+    conn.execute("DELETE FROM sources WHERE run_id = ?", (run_id,))
+    conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
@@ -0,0 +1,75 @@
+from __future__ import annotations
+import base64
+import heapq
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Typed sort keys are (group, value, id). Groups keep values of different types
+# apart so comparisons never raise, and order them numbers, strings, missing;
+# for descending order the groups are flipped so missing values still sort last.
+# The id tie-breaker makes every key unique, which keyset pagination relies on.
+SortKey = Tuple[int, Any, str]
+
+
+def field_getter(field: str) -> Callable[[Dict[str, Any]], Any]:
+    """Accessor for a top-level field, ``popularity_metrics.<name>`` or a bare metric name."""
+    if field.startswith("popularity_metrics."):
+        name = field.split(".", 1)[1]
+        return lambda it: (it.get("popularity_metrics") or {}).get(name)
+
+    def get(it: Dict[str, Any]) -> Any:
+        if field in it:
+            return it[field]
+        return (it.get("popularity_metrics") or {}).get(field)
+
+    return get
+
+
+def typed_key(value: Any, item_id: str, desc: bool) -> SortKey:
+    if isinstance(value, (int, float)) and value == value:  # excludes NaN
+        group, v = 0, float(value)
+    elif isinstance(value, str):
+        group, v = 1, value
+    else:
+        group, v = 2, 0.0
+    return ((2 - group) if desc else group, v, item_id)
+
+
+def encode_cursor(key: SortKey) -> str:
+    raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    """Parse a cursor produced by encode_cursor; raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        group, value, item_id = json.loads(raw)
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+    if not isinstance(group, int) or not isinstance(item_id, str) or not isinstance(value, (int, float, str)):
+        raise ValueError("invalid cursor")
+    return (group, float(value) if isinstance(value, (int, float)) else value, item_id)
+
+
+def select(
+    keyed: Sequence[Tuple[SortKey, Dict[str, Any]]], k: int, desc: bool, after: Optional[SortKey] = None
+) -> List[Tuple[SortKey, Dict[str, Any]]]:
+    """Return the next ``k`` (key, item) pairs after ``after`` in O(n log k).
+
+    Uses partial selection with a heap instead of sorting the whole partition,
+    so the cost of a page does not depend on how deep it is.
+    """
+    if after is None:
+        candidates = keyed
+    elif desc:
+        candidates = (p for p in keyed if _comparable(p[0], after) and p[0] < after)
+    else:
+        candidates = (p for p in keyed if _comparable(p[0], after) and p[0] > after)
+    pick = heapq.nlargest if desc else heapq.nsmallest
+    return pick(k, candidates, key=lambda p: p[0])
+
+
+def _comparable(key: SortKey, cursor: SortKey) -> bool:
+    # Same group implies same value type; different groups compare on group alone
+    return key[0] != cursor[0] or type(key[1]) is type(cursor[1])
@@ -0,0 +1,204 @@
+"""Minimal in-process metrics registry rendered in the Prometheus text format.
+
+Counters, gauges and histograms with labels, without a client library
+dependency. Values are per process: with several workers, scrape each one
+(the ingestion metrics only move on the leader).
+"""
+from __future__ import annotations
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+from starlette.routing import compile_path
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+REFRESH_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 3600.0)
+
+_registry: List["_Metric"] = []
+
+
+def _fmt(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _labels(self, key: LabelValues, extra: Sequence[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}"
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{self._labels(k)} {_fmt(v)}" for k, v in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket (non-cumulative, last is +Inf)], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][bisect_left(self.buckets, value)] += 1
+            entry[1][0] += value
+
+    def time(self, **labels: str) -> "_Timer":
+        return _Timer(self, labels)
+
+    def _samples(self) -> List[str]:
+        out = []
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                running = 0
+                for bound, n in zip(self.buckets + (math.inf,), counts):
+                    running += n
+                    out.append(f"{self.name}_bucket{self._labels(key, [('le', _fmt(bound))])} {running}")
+                out.append(f"{self.name}_sum{self._labels(key)} {_fmt(round(total[0], 6))}")
+                out.append(f"{self.name}_count{self._labels(key)} {running}")
+        return out
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+        self.seconds = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self._start
+        self.histogram.observe(self.seconds, **self.labels)
+        return False
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (0.0.4)."""
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# --- Outbound fetches (app/services/http.py, ingestion) ---
+fetch_seconds = Histogram("n8n_fetch_duration_seconds", "Outbound HTTP request latency", ("host",))
+fetch_bytes = Counter("n8n_fetch_response_bytes_total", "Response body bytes received", ("host",))
+fetch_requests = Counter("n8n_fetch_requests_total", "Outbound HTTP requests by status code", ("host", "status"))
+fetch_cache = Counter(
+    "n8n_fetch_cache_total", "HTTP cache lookups: hit (served), revalidated (304) or miss (fetched)", ("host", "result")
+)
+fetch_retries = Counter("n8n_fetch_retries_total", "Retried requests after throttling", ("source",))
+youtube_quota = Counter("n8n_youtube_quota_units_total", "YouTube Data API quota units spent", ("call",))
+trends_rate = Gauge("n8n_trends_rate_per_second", "Current adaptive Google Trends request rate")
+
+# --- Refresh pipeline (app/services/jobs.py) ---
+source_seconds = Histogram("n8n_ingest_source_duration_seconds", "Time to fetch one platform/country source", ("source",))
+source_items = Gauge("n8n_ingest_source_items", "Items returned by each source in the last refresh", ("source",))
+stage_seconds = Histogram("n8n_refresh_stage_duration_seconds", "Refresh stage durations", ("stage",), REFRESH_BUCKETS)
+stage_items = Gauge("n8n_refresh_stage_items", "Items leaving each stage in the last refresh", ("stage",))
+refresh_seconds = Histogram("n8n_refresh_duration_seconds", "Total refresh duration", ("status",), REFRESH_BUCKETS)
+refresh_total = Counter("n8n_refresh_total", "Refresh jobs by final status", ("status",))
+refresh_last_success = Gauge("n8n_refresh_last_success_timestamp_seconds", "Unix time of the last successful refresh")
+
+# --- API ---
+api_seconds = Histogram("n8n_api_request_duration_seconds", "API request latency", ("method", "route", "status"))
+
+
+_templates: List[Tuple["re.Pattern[str]", str]] = []
+
+
+def _route_template(request) -> str:
+    route = request.scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    # Responses served by middleware (e.g. the response cache) never reach
+    # routing; match them against the documented path templates instead
+    if not _templates:
+        for template in request.app.openapi().get("paths", {}):
+            _templates.append((compile_path(template)[0], template))
+    for regex, template in _templates:
+        if regex.match(request.url.path):
+            return template
+    return "unmatched"
+
+
+async def api_middleware(request, call_next):
+    """Time every API request, labelled by route template rather than raw path."""
+    start = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        api_seconds.observe(
+            time.perf_counter() - start, method=request.method, route=_route_template(request), status=status
+        )
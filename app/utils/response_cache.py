@@ -0,0 +1,200 @@
+from __future__ import annotations
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+
+from app.config import settings
+from app.sched.scheduler import cron_trigger
+from app.store import repository
+
+
+# Read endpoints whose responses depend only on the dataset version
+CACHED_PREFIXES = ("/workflows", "/stats")
+# ...except these: export streams, and history is appended after the dataset is saved
+UNCACHED_SUFFIXES = ("/export", "/history")
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    media_type: Optional[str]
+    etag: str
+
+
+class ResponseCache:
+    """Byte-bounded LRU of serialized responses."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str, str], CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Tuple[str, str, str], entry: CachedResponse):
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.body)
+            self._entries[key] = entry
+            self._bytes += len(entry.body)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+cache = ResponseCache(int(settings.RESPONSE_CACHE_MAX_MB * 1024 * 1024))
+_trigger = None
+_window: Tuple[Optional[datetime], Optional[datetime]] = (None, None)
+# Longest gap between two CRON_SCHEDULE fires we look back for (yearly schedules)
+_MAX_LOOKBACK = timedelta(days=400)
+
+
+def cacheable(request: Request) -> bool:
+    path = request.url.path.rstrip("/")
+    return (
+        request.method == "GET"
+        and cache.max_bytes > 0
+        and path.startswith(CACHED_PREFIXES)
+        and not path.endswith(UNCACHED_SUFFIXES)
+    )
+
+
+def normalized_query(request: Request) -> str:
+    return urlencode(sorted(parse_qsl(request.url.query, keep_blank_values=True)))
+
+
+def make_etag(version: str, path: str, query: str) -> str:
+    """Strong validator: changes exactly when the dataset version (or the request) does."""
+    digest = hashlib.sha1(f"{path}?{query}".encode("utf-8")).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def _fire_window(now: datetime) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """(last CRON_SCHEDULE fire at or before ``now``, next fire after it), cached until the next fire."""
+    global _trigger, _window
+    if _trigger is None:
+        _trigger = cron_trigger()
+    prev, nxt = _window
+    if nxt is not None and now < nxt and (prev is None or prev <= now):
+        return _window
+    nxt = _trigger.get_next_fire_time(None, now)
+    prev = None
+    # Triggers only look forward: find a fire in a growing look-back window, then walk up to now
+    lookback = timedelta(minutes=1)
+    while lookback <= _MAX_LOOKBACK:
+        fire = _trigger.get_next_fire_time(None, now - lookback)
+        if fire is not None and fire <= now:
+            while True:
+                after = _trigger.get_next_fire_time(None, fire + timedelta(seconds=1))
+                if after is None or after > now:
+                    break
+                fire = after
+            prev = fire
+            break
+        lookback *= 2
+    _window = (prev, nxt)
+    return _window
+
+
+def seconds_until_refresh(now: Optional[datetime] = None) -> int:
+    """Seconds until CRON_SCHEDULE next fires."""
+    now = now or datetime.now(timezone.utc)
+    nxt = _fire_window(now)[1]
+    return max(0, int((nxt - now).total_seconds())) if nxt else 0
+
+
+def _parse_utc(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.removesuffix("Z"))
+    except ValueError:
+        return None
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+
+def cache_control(snapshot: repository.Snapshot, now: Optional[datetime] = None) -> str:
+    """Cache-Control for a response built from ``snapshot``.
+
+    Seeds, and datasets older than the last scheduled refresh (still running,
+    failed or missed), revalidate every time. Otherwise downstream caches get
+    a short max-age plus stale-while-revalidate, so a refresh (scheduled or
+    manual) reaches them within RESPONSE_MAX_AGE_S instead of a full cron period.
+    """
+    if snapshot.seeded:
+        return "no-cache"
+    now = now or datetime.now(timezone.utc)
+    prev, _ = _fire_window(now)
+    updated = _parse_utc((snapshot.stats or {}).get("updated_at"))
+    if prev is not None and (updated is None or updated < prev):
+        return "no-cache"
+    max_age = min(settings.RESPONSE_MAX_AGE_S, seconds_until_refresh(now))
+    return f"public, max-age={max_age}, stale-while-revalidate={settings.RESPONSE_STALE_S}"
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+async def middleware(request: Request, call_next):
+    """Serve GET /workflows and /stats from the cache, with ETag / 304 and Cache-Control.
+
+    The cache key includes the dataset version, so a refresh invalidates
+    everything at once without explicit purging.
+    """
+    if not cacheable(request):
+        return await call_next(request)
+
+    snapshot = await run_in_threadpool(repository.get_snapshot)
+    path = request.url.path
+    query = normalized_query(request)
+    etag = make_etag(snapshot.version, path, query)
+    headers = {"ETag": etag, "Cache-Control": cache_control(snapshot)}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    key = (path, query, snapshot.version)
+    hit = cache.get(key)
+    if hit is not None:
+        return Response(hit.body, media_type=hit.media_type, headers={**headers, "X-Cache": "HIT"})
+
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    media_type = response.headers.get("content-type")
+    out_headers = {k: v for k, v in response.headers.items() if k.lower() not in ("content-length", "content-type")}
+    # A refresh may have landed while the handler ran; then the body can't be tied to either version
+    if (await run_in_threadpool(repository.get_snapshot)).version == snapshot.version:
+        cache.put(key, CachedResponse(body, media_type, etag))
+        out_headers.update(headers)
+    out_headers["X-Cache"] = "MISS"
+    return Response(body, status_code=200, media_type=media_type, headers=out_headers)
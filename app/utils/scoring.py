@@ -1,10 +1,23 @@
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Optional, Sequence
+
+# Maps (metric name, value) to [0, 1], or None to fall back to the fixed cap.
+# Set by SCORE_NORMALIZATION=quantile (percentile ranks from sketches).
+Scale = Callable[[str, float], Optional[float]]
 
 
 def safe_div(n: float, d: float) -> float:
     return (n / d) if d else 0.0
 
+
+def _scaled(scale: Optional[Scale], name: str, value: float, capped: float) -> float:
+    if scale is not None:
+        ranked = scale(name, value)
+        if ranked is not None:
+            return ranked
+    return capped
+
+
 def compute_youtube_ratios(metrics: Dict[str, Any]) -> Dict[str, Any]:
     views = float(metrics.get("views", 0))
     likes = float(metrics.get("likes", 0))
@@ -23,57 +36,234 @@ def compute_forum_ratios(metrics: Dict[str, Any]) -> Dict[str, Any]:
     return metrics
 
 
-def youtube_score(metrics: Dict[str, Any]) -> float:
+def youtube_score(metrics: Dict[str, Any], scale: Optional[Scale] = None) -> float:
     views = float(metrics.get("views", 0))
     likes = float(metrics.get("likes", 0))
     comments = float(metrics.get("comments", 0))
     lvr = float(metrics.get("like_to_view_ratio", 0))
 
     # Heuristic normalization caps for POC
-    v = min(1.0, views / 200_000)
-    l = min(1.0, likes / 5_000)
-    c = min(1.0, comments / 1_000)
+    v = _scaled(scale, "views", views, min(1.0, views / 200_000))
+    l = _scaled(scale, "likes", likes, min(1.0, likes / 5_000))
+    c = _scaled(scale, "comments", comments, min(1.0, comments / 1_000))
+    r = _scaled(scale, "like_to_view_ratio", lvr, min(1.0, lvr * 50))
 
     # Weighted sum, keep in [0,1]
-    score = 0.45 * v + 0.3 * l + 0.15 * c + 0.10 * min(1.0, lvr * 50)
+    score = 0.45 * v + 0.3 * l + 0.15 * c + 0.10 * r
     return round(min(1.0, score), 6)
 
 
-def forum_score(metrics: Dict[str, Any]) -> float:
+def forum_score(metrics: Dict[str, Any], scale: Optional[Scale] = None) -> float:
     views = float(metrics.get("views", 0))
     replies = float(metrics.get("replies", 0))
     likes = float(metrics.get("likes", 0))
     contributors = float(metrics.get("contributors", 0))
 
-    v = min(1.0, views / 20_000)
-    r = min(1.0, replies / 200)
-    l = min(1.0, likes / 300)
-    u = min(1.0, contributors / 60)
+    v = _scaled(scale, "views", views, min(1.0, views / 20_000))
+    r = _scaled(scale, "replies", replies, min(1.0, replies / 200))
+    l = _scaled(scale, "likes", likes, min(1.0, likes / 300))
+    u = _scaled(scale, "contributors", contributors, min(1.0, contributors / 60))
 
     score = 0.4 * v + 0.3 * r + 0.2 * l + 0.1 * u
     return round(min(1.0, score), 6)
 
 
-def trends_score(metrics: Dict[str, Any]) -> float:
+def trends_score(metrics: Dict[str, Any], scale: Optional[Scale] = None) -> float:
     msv = float(metrics.get("monthly_search_volume", 0))
     change = float(metrics.get("trend_30d_change", 0))  # fraction, e.g. 0.25 for +25%
     interest = float(metrics.get("interest_score", 0))  # 0-100
 
-    v = min(1.0, msv / 100_000)
-    t = max(0.0, min(1.0, (change + 0.5)))  # shift to keep [-0.5, +0.5] in [0,1]
-    i = min(1.0, interest / 100.0)
+    v = _scaled(scale, "monthly_search_volume", msv, min(1.0, msv / 100_000))
+    # shift to keep [-0.5, +0.5] in [0,1]
+    t = _scaled(scale, "trend_30d_change", change, max(0.0, min(1.0, (change + 0.5))))
+    i = _scaled(scale, "interest_score", interest, min(1.0, interest / 100.0))
 
     score = 0.5 * v + 0.3 * i + 0.2 * t
     return round(min(1.0, score), 6)
 
 
-def compute_popularity(platform: str, metrics: Dict[str, Any]) -> Dict[str, Any]:
+def momentum_score(platform: str, metrics: Dict[str, Any]) -> float:
+    """Score recent growth in [0, 1] from the *_per_day EWMA rates.
+
+    Google items use trend_30d_change, which already measures momentum.
+    """
+    if platform == "YouTube":
+        v = min(1.0, max(0.0, float(metrics.get("views_per_day", 0))) / 5_000)
+        l = min(1.0, max(0.0, float(metrics.get("likes_per_day", 0))) / 200)
+        c = min(1.0, max(0.0, float(metrics.get("comments_per_day", 0))) / 40)
+        score = 0.6 * v + 0.3 * l + 0.1 * c
+    elif platform == "Forum":
+        v = min(1.0, max(0.0, float(metrics.get("views_per_day", 0))) / 500)
+        r = min(1.0, max(0.0, float(metrics.get("replies_per_day", 0))) / 10)
+        l = min(1.0, max(0.0, float(metrics.get("likes_per_day", 0))) / 15)
+        score = 0.5 * v + 0.3 * r + 0.2 * l
+    else:  # Google
+        score = max(0.0, min(1.0, float(metrics.get("trend_30d_change", 0)) + 0.5))
+    return round(min(1.0, score), 6)
+
+
+# Share of momentum in popularity_score when compute_popularity(momentum=True)
+MOMENTUM_WEIGHT = 0.5
+
+
+# Metrics whose distribution is sketched per (platform, country) for
+# SCORE_NORMALIZATION=quantile; the score functions look these names up.
+QUANTILE_METRICS = {
+    "YouTube": ("views", "likes", "comments", "like_to_view_ratio"),
+    "Forum": ("views", "replies", "likes", "contributors"),
+    "Google": ("monthly_search_volume", "interest_score", "trend_30d_change"),
+}
+
+
+def compute_popularity(
+    platform: str, metrics: Dict[str, Any], momentum: bool = False, scale: Optional[Scale] = None
+) -> Dict[str, Any]:
     if platform == "YouTube":
         metrics = compute_youtube_ratios(metrics)
-        score = youtube_score(metrics)
+        score = youtube_score(metrics, scale)
     elif platform == "Forum":
         metrics = compute_forum_ratios(metrics)
-        score = forum_score(metrics)
+        score = forum_score(metrics, scale)
     else:  # Google
-        score = trends_score(metrics)
+        score = trends_score(metrics, scale)
+    if momentum:
+        blended = (1 - MOMENTUM_WEIGHT) * score + MOMENTUM_WEIGHT * momentum_score(platform, metrics)
+        score = round(min(1.0, blended), 6)
     return metrics, score
+
+
+# --- Batch scoring (NumPy) ---
+#
+# Columnar counterparts of the scalar functions above for re-scoring many
+# items at once. They apply the same caps, weights and operation order and
+# reproduce Python's round(x, 6), so results are bit-identical to the scalar
+# path. NumPy is imported lazily; it is only needed when these are used.
+
+YOUTUBE_WEIGHTS = (0.45, 0.3, 0.15, 0.10)  # views, likes, comments, like_to_view_ratio
+FORUM_WEIGHTS = (0.4, 0.3, 0.2, 0.1)  # views, replies, likes, contributors
+TRENDS_WEIGHTS = (0.5, 0.3, 0.2)  # monthly_search_volume, interest_score, trend_30d_change
+
+BATCH_COLUMNS = {
+    "YouTube": ("views", "likes", "comments"),
+    "Forum": ("views", "replies", "likes", "contributors"),
+    "Google": ("monthly_search_volume", "trend_30d_change", "interest_score"),
+}
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except Exception as e:  # pragma: no cover - depends on environment
+        raise RuntimeError("numpy is required for batch scoring") from e
+    return np
+
+
+def _round6(np, x):
+    """Elementwise round(x, 6) that matches Python's correctly rounded result.
+
+    np.round scales by 1e6 before rounding, which can land on the other side
+    of a .5 tie; those few near-tie elements are re-rounded in Python.
+    """
+    out = np.round(x, 6)
+    scaled = x * 1e6
+    dist = np.abs(scaled - np.floor(scaled) - 0.5)
+    near_tie = dist <= np.maximum(1e-6, np.abs(scaled) * 1e-14)
+    if near_tie.any():
+        idx = np.flatnonzero(near_tie)
+        out[idx] = [round(float(v), 6) for v in x[idx]]
+    return out
+
+
+def _safe_div_batch(np, n, d):
+    out = np.zeros_like(n)
+    np.divide(n, d, out=out, where=d != 0)
+    return out
+
+
+def _column(np, columns: Dict[str, Any], name: str, size: int):
+    col = columns.get(name)
+    if col is None:
+        return np.zeros(size, dtype=np.float64)
+    return np.asarray(col, dtype=np.float64)
+
+
+def _batch_size(columns: Dict[str, Any]) -> int:
+    return max((len(v) for v in columns.values() if v is not None), default=0)
+
+
+def youtube_scores_batch(columns: Dict[str, Any], weights: Sequence[float] = YOUTUBE_WEIGHTS) -> Dict[str, Any]:
+    np = _numpy()
+    n = _batch_size(columns)
+    views, likes, comments = (_column(np, columns, k, n) for k in BATCH_COLUMNS["YouTube"])
+    lvr = _round6(np, _safe_div_batch(np, likes, views))
+    cvr = _round6(np, _safe_div_batch(np, comments, views))
+
+    v = np.minimum(1.0, views / 200_000)
+    l = np.minimum(1.0, likes / 5_000)
+    c = np.minimum(1.0, comments / 1_000)
+    wv, wl, wc, wr = weights
+    score = wv * v + wl * l + wc * c + wr * np.minimum(1.0, lvr * 50)
+    return {"like_to_view_ratio": lvr, "comment_to_view_ratio": cvr, "popularity_score": _round6(np, np.minimum(1.0, score))}
+
+
+def forum_scores_batch(columns: Dict[str, Any], weights: Sequence[float] = FORUM_WEIGHTS) -> Dict[str, Any]:
+    np = _numpy()
+    n = _batch_size(columns)
+    views, replies, likes, contributors = (_column(np, columns, k, n) for k in BATCH_COLUMNS["Forum"])
+    rvr = _round6(np, _safe_div_batch(np, replies, views))
+    lvr = _round6(np, _safe_div_batch(np, likes, views))
+
+    v = np.minimum(1.0, views / 20_000)
+    r = np.minimum(1.0, replies / 200)
+    l = np.minimum(1.0, likes / 300)
+    u = np.minimum(1.0, contributors / 60)
+    wv, wr, wl, wu = weights
+    score = wv * v + wr * r + wl * l + wu * u
+    return {"reply_to_view_ratio": rvr, "like_to_view_ratio": lvr, "popularity_score": _round6(np, np.minimum(1.0, score))}
+
+
+def trends_scores_batch(columns: Dict[str, Any], weights: Sequence[float] = TRENDS_WEIGHTS) -> Dict[str, Any]:
+    np = _numpy()
+    n = _batch_size(columns)
+    msv, change, interest = (_column(np, columns, k, n) for k in BATCH_COLUMNS["Google"])
+
+    v = np.minimum(1.0, msv / 100_000)
+    t = np.maximum(0.0, np.minimum(1.0, (change + 0.5)))
+    i = np.minimum(1.0, interest / 100.0)
+    wv, wi, wt = weights
+    score = wv * v + wi * i + wt * t
+    return {"popularity_score": _round6(np, np.minimum(1.0, score))}
+
+
+def compute_popularity_batch(
+    platform: str, columns: Dict[str, Any], weights: Optional[Sequence[float]] = None
+) -> Dict[str, Any]:
+    """Score columnar metrics for one platform in a single vectorized pass.
+
+    ``columns`` maps metric names (see BATCH_COLUMNS) to equal-length arrays;
+    missing columns count as zeros. Returns the derived ratio columns plus
+    ``popularity_score``. ``weights`` overrides the default weighted sum.
+    """
+    if platform == "YouTube":
+        return youtube_scores_batch(columns, weights or YOUTUBE_WEIGHTS)
+    if platform == "Forum":
+        return forum_scores_batch(columns, weights or FORUM_WEIGHTS)
+    return trends_scores_batch(columns, weights or TRENDS_WEIGHTS)
+
+
+def score_items(items: Sequence[Dict[str, Any]]) -> None:
+    """Re-score items in place, batching them per platform."""
+    by_platform: Dict[str, list] = {}
+    for it in items:
+        by_platform.setdefault(it.get("platform", "Google"), []).append(it)
+
+    for platform, group in by_platform.items():
+        names = BATCH_COLUMNS.get(platform, BATCH_COLUMNS["Google"])
+        columns = {k: [float(it["popularity_metrics"].get(k, 0)) for it in group] for k in names}
+        out = compute_popularity_batch(platform, columns)
+        scores = out.pop("popularity_score").tolist()
+        derived = {k: v.tolist() for k, v in out.items()}
+        for idx, it in enumerate(group):
+            for k, values in derived.items():
+                it["popularity_metrics"][k] = values[idx]
+            it["popularity_score"] = scores[idx]
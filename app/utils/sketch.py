@@ -0,0 +1,107 @@
+"""KLL quantile sketch: one-pass, mergeable, bounded-memory rank estimates.
+
+A stack of compactors where level ``h`` holds values of weight ``2**h``. When
+the sketch is full, the lowest over-capacity level is sorted and every other
+value is promoted to the next level, so the sketch keeps O(k log(n / k))
+values for ``n`` updates. Rank error is about 1.7 / k of ``n`` (k=200: under
+1%); up to ``k`` values the sketch is exact.
+
+Sketches merge by concatenating levels and compacting, so per-run or
+per-node sketches combine into one without revisiting the data.
+"""
+from __future__ import annotations
+import math
+import random
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List
+
+
+class KLLSketch:
+    def __init__(self, k: int = 200):
+        self.k = max(8, int(k))
+        self.n = 0
+        self.levels: List[List[float]] = [[]]
+        self._size = 0
+        self._max_size = self._capacity(0)
+        # Seeded so the same stream always yields the same sketch
+        self._coin = random.Random(0)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _grow(self):
+        self.levels.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def _compress(self):
+        for h in range(len(self.levels)):
+            if len(self.levels[h]) >= self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self._grow()
+                level = sorted(self.levels[h])
+                # An odd value out stays behind; the rest halve into level h + 1
+                keep = [level.pop(0)] if len(level) % 2 else []
+                self.levels[h + 1].extend(level[self._coin.getrandbits(1) :: 2])
+                self.levels[h] = keep
+                self._size = sum(len(lv) for lv in self.levels)
+                if self._size < self._max_size:
+                    break
+
+    def update(self, value: float):
+        self.levels[0].append(value)
+        self.n += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold ``other`` into this sketch (in place) and return it."""
+        while len(self.levels) < len(other.levels):
+            self._grow()
+        for h, values in enumerate(other.levels):
+            self.levels[h].extend(values)
+        self.n += other.n
+        self._size = sum(len(lv) for lv in self.levels)
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def ranker(self) -> "Ranker":
+        return Ranker(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"k": self.k, "n": self.n, "levels": [list(lv) for lv in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KLLSketch":
+        sketch = cls(data.get("k", 200))
+        sketch.levels = [[float(v) for v in lv] for lv in data.get("levels") or [[]]] or [[]]
+        sketch.n = int(data.get("n", 0))
+        sketch._size = sum(len(lv) for lv in sketch.levels)
+        sketch._max_size = sum(sketch._capacity(h) for h in range(len(sketch.levels)))
+        return sketch
+
+
+class Ranker:
+    """Frozen view of a sketch answering percentile-rank queries in O(log k)."""
+
+    def __init__(self, sketch: KLLSketch):
+        weighted = sorted((v, 1 << h) for h, lv in enumerate(sketch.levels) for v in lv)
+        self.values = [v for v, _ in weighted]
+        self.cumulative: List[int] = []
+        total = 0
+        for _, w in weighted:
+            total += w
+            self.cumulative.append(total)
+        self.total = total
+
+    def percentile(self, value: float) -> float:
+        """Mid-rank of ``value`` in [0, 1]: share below it plus half the share equal to it."""
+        if not self.total:
+            return 0.0
+        lo = bisect_left(self.values, value)
+        hi = bisect_right(self.values, value)
+        below = self.cumulative[lo - 1] if lo else 0
+        upto = self.cumulative[hi - 1] if hi else 0
+        return (below + upto) / (2 * self.total)
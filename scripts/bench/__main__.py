@@ -0,0 +1,113 @@
+"""Run the benchmark suite and write one JSON report.
+
+    python -m scripts.bench [--size quick|default|large] [--out bench.json] [--only api,startup]
+
+Every benchmark runs in its own interpreter (so peak RSS is per benchmark)
+against synthetic data and local stubs; no network or API keys are needed.
+Reports carry the git commit and host details so runs can be compared.
+"""
+from __future__ import annotations
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+SIZES: Dict[str, Dict[str, List[str]]] = {
+    "quick": {
+        "api": ["--rows", "10000", "--requests", "2000"],
+        "startup": ["--rows", "10000", "--runs", "2"],
+        "ingestion": ["--latency", "0.01"],
+        "scoring": ["--rows", "100000"],
+        "export": ["--rows", "100000"],
+    },
+    "default": {
+        "api": ["--rows", "100000", "--requests", "8000"],
+        "startup": ["--rows", "100000"],
+        "ingestion": ["--latency", "0.05", "--cache"],
+        "scoring": ["--rows", "1000000"],
+        "export": ["--rows", "1000000", "--gzip"],
+    },
+    "large": {
+        "api": ["--rows", "1000000", "--requests", "20000"],
+        "startup": ["--rows", "1000000"],
+        "ingestion": ["--latency", "0.1", "--cache"],
+        "scoring": ["--rows", "5000000"],
+        "export": ["--rows", "5000000", "--gzip"],
+    },
+}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _parse_report(stdout: str) -> dict:
+    # Benchmarks print one (indented) JSON object last; skip any log lines before it
+    m = re.search(r"^\{", stdout, re.MULTILINE)
+    if m is None:
+        raise ValueError("no JSON report in benchmark output")
+    return json.loads(stdout[m.start():])
+
+
+def run(name: str, args: List[str]) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-m", f"scripts.bench.{name}", *args], capture_output=True, text=True)
+    elapsed = round(time.perf_counter() - start, 3)
+    try:
+        report = _parse_report(proc.stdout)
+    except ValueError as e:
+        report = {"error": str(e), "stderr": proc.stderr[-2000:]}
+    report["exit_code"] = proc.returncode
+    report["wall_s"] = elapsed
+    report["args"] = args
+    return report
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--size", choices=sorted(SIZES), default="default")
+    ap.add_argument("--only", help="comma-separated subset of: " + ", ".join(SIZES["default"]))
+    ap.add_argument("--out", help="also write the report to this file")
+    args = ap.parse_args(argv)
+
+    plan = SIZES[args.size]
+    names = [n.strip() for n in args.only.split(",")] if args.only else list(plan)
+    unknown = [n for n in names if n not in plan]
+    if unknown:
+        ap.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    report = {
+        "suite": "n8n-popularity-bench",
+        "size": args.size,
+        "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "benchmarks": {},
+    }
+    for name in names:
+        print(f"[Bench] {name} {' '.join(plan[name])}", file=sys.stderr)
+        report["benchmarks"][name] = run(name, plan[name])
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+    return 0 if all(b["exit_code"] == 0 for b in report["benchmarks"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""In-process load test of the read API on a synthetic dataset.
+
+    python -m scripts.bench.api --rows 100000 --requests 4000 --concurrency 16 [--cache]
+
+Saves ``--rows`` synthetic items into a throwaway store (timing entity
+resolution, ``save_all`` and the /stats aggregates on the way), then drives
+the ASGI app through httpx without sockets, so the numbers are the
+application's own cost. The response cache is off unless ``--cache``.
+Reports per-route throughput and p50/p99 latency, plus peak RSS.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import re
+import resource
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+# (name, path builder); each request draws its own parameters so the mix
+# exercises different partitions, offsets and queries
+Route = Tuple[str, Callable[[random.Random], str]]
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (q in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(q / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+def routes(words: List[str]) -> List[Route]:
+    platforms = ("YouTube", "Forum", "Google")
+    countries = ("US", "IN")
+    return [
+        ("list", lambda r: f"/workflows/?limit=50&offset={r.randrange(0, 1000, 50)}"),
+        (
+            "list_filtered",
+            lambda r: f"/workflows/?platform={r.choice(platforms)}&country={r.choice(countries)}"
+            "&sort_by=popularity_metrics.views&limit=50",
+        ),
+        ("list_fields", lambda r: "/workflows/?limit=100&fields=workflow,platform,popularity_score"),
+        ("top", lambda r: f"/workflows/top?limit=10&country={r.choice(countries)}"),
+        ("stats", lambda r: "/stats/"),
+        ("search", lambda r: f"/workflows/search?q={r.choice(words)}&limit=20"),
+        ("suggest", lambda r: f"/workflows/search/suggest?q={r.choice(words)[:3]}"),
+        ("entities", lambda r: f"/workflows/entities?limit=50&offset={r.randrange(0, 500, 50)}"),
+    ]
+
+
+async def _drive(app, plan: List[Tuple[str, str]], concurrency: int):
+    import httpx
+
+    results: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    queue = iter(plan)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def worker():
+            for name, path in queue:
+                start = time.perf_counter()
+                resp = await client.get(path)
+                results.setdefault(name, []).append(time.perf_counter() - start)
+                if resp.status_code >= 400:
+                    errors[name] = errors.get(name, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return results, errors, elapsed
+
+
+async def _first_requests(app, paths: List[Tuple[str, str]]) -> Dict[str, float]:
+    """Latency of each route's first call (lazy indexes are built here)."""
+    import httpx
+
+    out = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for name, path in paths:
+            start = time.perf_counter()
+            resp = await client.get(path)
+            resp.raise_for_status()
+            out[name] = round((time.perf_counter() - start) * 1000, 2)
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--requests", type=int, default=4000)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--cache", action="store_true", help="keep the in-memory response cache on")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    # App logs go to stderr so stdout stays one JSON report
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(sys.stderr):
+        # Settings are read at import time, so point the store at tmp first
+        os.environ.update(
+            DATA_FILE=os.path.join(tmp, "workflows.json"),
+            DB_FILE=os.path.join(tmp, "workflows.sqlite3"),
+            HISTORY_DIR=os.path.join(tmp, "history"),
+            MOMENTUM_FILE=os.path.join(tmp, "momentum.json"),
+            HTTP_CACHE_FILE=os.path.join(tmp, "http_cache.sqlite3"),
+            RESPONSE_CACHE_MAX_MB=os.environ.get("RESPONSE_CACHE_MAX_MB", "64") if args.cache else "0",
+            SEED_FILE="",
+        )
+        from app.main import app
+        from app.services.entities import resolve_entities
+        from app.store import repository
+        from app.store.aggregates import compute_stats
+        from scripts.bench.synth import generate_items, seed_titles
+
+        dataset = {}
+        start = time.perf_counter()
+        items = list(generate_items(args.rows))
+        dataset["generate_s"] = round(time.perf_counter() - start, 3)
+        start = time.perf_counter()
+        resolve_entities(items)
+        dataset["entities_s"] = round(time.perf_counter() - start, 3)
+        start = time.perf_counter()
+        repository.save_all(items)
+        dataset["save_all_s"] = round(time.perf_counter() - start, 3)
+        start = time.perf_counter()
+        compute_stats(items, "bench")
+        dataset["stats_s"] = round(time.perf_counter() - start, 3)
+        del items
+        rss_dataset = _rss_mb()
+
+        words = sorted({w for t in seed_titles() for w in re.findall(r"[a-z]{4,}", t.lower())}) or ["workflow"]
+        rng = random.Random(args.seed)
+        mix = routes(words)
+        first = asyncio.run(_first_requests(app, [(name, build(rng)) for name, build in mix]))
+        plan = [(name, build(rng)) for name, build in (mix[i % len(mix)] for i in range(args.requests))]
+        results, errors, elapsed = asyncio.run(_drive(app, plan, args.concurrency))
+
+    per_route = {}
+    for name, _ in mix:
+        lat = sorted(results.get(name, []))
+        per_route[name] = {
+            "requests": len(lat),
+            "errors": errors.get(name, 0),
+            "first_ms": first.get(name),
+            "p50_ms": round(percentile(lat, 50) * 1000, 3),
+            "p99_ms": round(percentile(lat, 99) * 1000, 3),
+            "mean_ms": round(sum(lat) / len(lat) * 1000, 3) if lat else 0.0,
+        }
+    every = sorted(v for lat in results.values() for v in lat)
+    report = {
+        "benchmark": "api",
+        "rows": args.rows,
+        "requests": len(every),
+        "concurrency": args.concurrency,
+        "response_cache": args.cache,
+        "seconds": round(elapsed, 3),
+        "requests_per_s": round(len(every) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(every, 50) * 1000, 3),
+        "p99_ms": round(percentile(every, 99) * 1000, 3),
+        "errors": sum(errors.values()),
+        "dataset": dataset,
+        "routes": per_route,
+        "peak_rss_mb_after_dataset": rss_dataset,
+        "peak_rss_mb": _rss_mb(),
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if not report["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
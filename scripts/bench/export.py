@@ -0,0 +1,61 @@
+"""Throughput of the NDJSON export stream on a synthetic dataset.
+
+    python -m scripts.bench.export --rows 2000000 [--gzip]
+
+Consumes the same generator GET /workflows/export streams, so it measures
+serialization (and compression) without HTTP overhead, and reports peak RSS.
+"""
+from __future__ import annotations
+import argparse
+import json
+import resource
+import sys
+import time
+
+from app.store import export
+from scripts.bench.synth import generate_items
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=2_000_000)
+    ap.add_argument("--gzip", action="store_true")
+    args = ap.parse_args(argv)
+
+    items = list(generate_items(args.rows))
+    rss_dataset = _rss_mb()
+
+    start = time.perf_counter()
+    stream = export.iter_ndjson(items)
+    if args.gzip:
+        stream = export.gzip_chunks(stream)
+    total_bytes = 0
+    chunks = 0
+    for chunk in stream:
+        total_bytes += len(chunk)
+        chunks += 1
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "benchmark": "export",
+        "rows": args.rows,
+        "gzip": args.gzip,
+        "seconds": round(elapsed, 3),
+        "rows_per_s": round(args.rows / elapsed),
+        "mb_per_s": round(total_bytes / elapsed / 1e6, 1),
+        "bytes": total_bytes,
+        "chunks": chunks,
+        "peak_rss_mb_after_dataset": rss_dataset,
+        "peak_rss_mb": _rss_mb(),
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Wall-clock benchmark of collect_all: serial path vs. the concurrent engine.
+
+Runs against local stub servers (no API keys or network needed)::
+
+    python -m scripts.bench.ingestion --latency 0.05 [--trends 5] [--cache]
+
+``--trends N`` also collects N Google Trends keywords through pytrends,
+redirected to the stub (0 skips Trends).
+
+The HTTP response cache is disabled for the serial/concurrent comparison;
+``--cache`` adds a cold vs. warm run through a throwaway cache file.
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from app.config import settings
+from app.services import http_cache, ingestion
+from scripts.bench.stub_servers import StubServer, pytrends_redirect
+
+
+def timed_collect(workers: int):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        items = ingestion.collect_all(max_workers=workers)
+    return time.perf_counter() - start, items
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--latency", type=float, default=0.05, help="per-request stub latency in seconds")
+    ap.add_argument("--workers", type=int, default=settings.INGEST_WORKERS)
+    ap.add_argument("--trends", type=int, default=5, help="Google Trends keywords to collect (0 = skip Trends)")
+    ap.add_argument("--cache", action="store_true", help="also measure cold vs. warm HTTP cache runs")
+    args = ap.parse_args(argv)
+
+    keywords = [k for k in settings.TRENDS_KEYWORDS.split(",") if k.strip()][: args.trends]
+    with StubServer(latency=args.latency) as stub, pytrends_redirect(stub.url):
+        settings.YOUTUBE_API_KEY = "bench"
+        settings.YOUTUBE_API_BASE = f"{stub.url}/youtube/v3"
+        settings.YOUTUBE_QUERIES = "n8n workflow"
+        settings.DISCOURSE_BASE_URL = stub.url
+        settings.TRENDS_KEYWORDS = ",".join(keywords)
+        # Pace Trends by the stub's latency, not by the production rate limit
+        settings.TRENDS_RATE = settings.TRENDS_MAX_RATE = 1000.0
+        settings.HTTP_CACHE_FILE = ""
+        # Keep one-off import costs (pytrends/pandas) out of both measurements
+        with contextlib.suppress(Exception):
+            import pytrends.request  # noqa: F401
+
+        serial_s, serial_items = timed_collect(1)
+        serial_requests = stub.requests
+        concurrent_s, concurrent_items = timed_collect(args.workers)
+        concurrent_requests = stub.requests - serial_requests
+
+        cache_report = None
+        if args.cache:
+            with tempfile.TemporaryDirectory() as tmp:
+                settings.HTTP_CACHE_FILE = os.path.join(tmp, "http_cache.sqlite3")
+                http_cache._cache = None
+                before = stub.requests
+                cold_s, _ = timed_collect(args.workers)
+                cold_requests, before = stub.requests - before, stub.requests
+                not_modified = stub.not_modified
+                warm_s, warm_items = timed_collect(args.workers)
+                cache_report = {
+                    "cold": {"seconds": round(cold_s, 3), "requests": cold_requests},
+                    "warm": {
+                        "seconds": round(warm_s, 3),
+                        "requests": stub.requests - before,
+                        "not_modified": stub.not_modified - not_modified,
+                    },
+                    "identical_output": warm_items == concurrent_items,
+                }
+                http_cache._cache = None
+
+    report = {
+        "benchmark": "ingestion",
+        "latency_s": args.latency,
+        "workers": args.workers,
+        "trends_keywords": len(keywords),
+        "items": len(concurrent_items),
+        "identical_output": serial_items == concurrent_items,
+        "serial": {"seconds": round(serial_s, 3), "requests": serial_requests},
+        "concurrent": {"seconds": round(concurrent_s, 3), "requests": concurrent_requests},
+        "speedup": round(serial_s / concurrent_s, 2) if concurrent_s else None,
+    }
+    if cache_report is not None:
+        report["cache"] = cache_report
+    print(json.dumps(report, indent=2))
+    return 0 if report["identical_output"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
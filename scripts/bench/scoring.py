@@ -0,0 +1,126 @@
+"""Scalar vs. batch (NumPy) popularity scoring on synthetic rows.
+
+    python -m scripts.bench.scoring --rows 1000000
+
+Checks that every ratio and score is bit-identical to the scalar functions,
+and times the KLL sketches behind SCORE_NORMALIZATION=quantile (one pass per
+metric, percentile lookups, worst rank error against the exact percentile).
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from app.utils.scoring import QUANTILE_METRICS, compute_popularity, compute_popularity_batch
+from app.utils.sketch import KLLSketch
+
+
+def synthetic_columns(platform: str, rows: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    if platform == "YouTube":
+        views = np.floor(rng.lognormal(9, 2, rows))
+        return {
+            "views": views,
+            "likes": np.floor(views * rng.uniform(0, 0.08, rows)),
+            "comments": np.floor(views * rng.uniform(0, 0.01, rows)),
+        }
+    if platform == "Forum":
+        views = np.floor(rng.lognormal(6, 1.5, rows))
+        return {
+            "views": views,
+            "replies": np.floor(rng.exponential(8, rows)),
+            "likes": np.floor(rng.exponential(5, rows)),
+            "contributors": np.floor(rng.exponential(4, rows)),
+        }
+    return {
+        "interest_score": np.round(rng.uniform(0, 100, rows), 2),
+        "trend_30d_change": np.round(rng.normal(0, 0.4, rows), 4),
+        "monthly_search_volume": np.floor(rng.lognormal(7, 2, rows)),
+    }
+
+
+def scalar_pass(platform: str, columns):
+    names = list(columns)
+    rows = zip(*(columns[k].tolist() for k in names))
+    out = []
+    for values in rows:
+        metrics, score = compute_popularity(platform, dict(zip(names, values)))
+        out.append((metrics, score))
+    return out
+
+
+def bench_quantile(platform: str, columns, k: int = 200):
+    update_s = rank_s = 0.0
+    retained = 0
+    max_error = 0.0
+    for name in QUANTILE_METRICS[platform]:
+        if name not in columns:
+            continue
+        values = columns[name].tolist()
+        start = time.perf_counter()
+        sketch = KLLSketch(k)
+        for v in values:
+            sketch.update(v)
+        ranker = sketch.ranker()
+        update_s += time.perf_counter() - start
+        retained += sum(len(lv) for lv in sketch.levels)
+
+        start = time.perf_counter()
+        ranks = np.array([ranker.percentile(v) for v in values])
+        rank_s += time.perf_counter() - start
+        exact_sorted = np.sort(columns[name])
+        exact = (np.searchsorted(exact_sorted, values, "left") + np.searchsorted(exact_sorted, values, "right")) / (
+            2 * len(values)
+        )
+        max_error = max(max_error, float(np.abs(ranks - exact).max()))
+    return {
+        "k": k,
+        "sketch_seconds": round(update_s, 3),
+        "percentile_seconds": round(rank_s, 3),
+        "retained_values": retained,
+        "max_rank_error": round(max_error, 5),
+    }
+
+
+def bench_platform(platform: str, rows: int):
+    columns = synthetic_columns(platform, rows)
+
+    start = time.perf_counter()
+    batch = compute_popularity_batch(platform, columns)
+    batch_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scalar = scalar_pass(platform, columns)
+    scalar_s = time.perf_counter() - start
+
+    expected = {"popularity_score": np.array([s for _, s in scalar])}
+    for k in batch:
+        if k != "popularity_score":
+            expected[k] = np.array([m[k] for m, _ in scalar])
+    identical = all(np.array_equal(batch[k].view(np.int64), expected[k].view(np.int64)) for k in batch)
+
+    return {
+        "rows": rows,
+        "scalar_seconds": round(scalar_s, 3),
+        "batch_seconds": round(batch_s, 3),
+        "speedup": round(scalar_s / batch_s, 1) if batch_s else None,
+        "bit_identical": identical,
+        "quantile": bench_quantile(platform, columns),
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    args = ap.parse_args(argv)
+
+    report = {"benchmark": "scoring", "platforms": {p: bench_platform(p, args.rows) for p in ("YouTube", "Forum", "Google")}}
+    print(json.dumps(report, indent=2))
+    return 0 if all(r["bit_identical"] for r in report["platforms"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Cold-start time of an API worker: imports, boot and first responses.
+
+    python -m scripts.bench.startup [--rows 100000] [--runs 3]
+
+Each run is a fresh interpreter on a throwaway store, so nothing is warm.
+Scenarios: ``seed`` (empty store, seeds served) and ``dataset`` (``--rows``
+synthetic items already saved). The benchmark holds the leader lock itself,
+so the measured worker boots as a standby and never starts a refresh.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Modules a serving worker should not import until a refresh runs
+HEAVY_MODULES = ("app.services.ingestion", "requests", "pytrends", "pandas")
+
+
+def _child() -> int:
+    start = time.perf_counter()
+    import app.main
+
+    imported = time.perf_counter()
+    from fastapi.testclient import TestClient
+
+    client = TestClient(app.main.app)
+    client.__enter__()  # runs the startup hook (snapshot load, leader election)
+    booted = time.perf_counter()
+    status = client.get("/workflows/?limit=10").status_code
+    first = time.perf_counter()
+    stats = client.get("/stats/").json()
+    done = time.perf_counter()
+    print(
+        json.dumps(
+            {
+                "import_s": imported - start,
+                "boot_s": booted - start,
+                "first_response_s": first - start,
+                "stats_s": done - first,
+                "status": status,
+                "items": stats.get("total"),
+                "seeded": stats.get("seeded", False),
+                "heavy_imported": sorted(m for m in HEAVY_MODULES if m in sys.modules),
+            }
+        )
+    )
+    sys.stdout.flush()
+    os._exit(0)  # skip shutdown hooks; only startup is measured
+
+
+def _run_once(env) -> dict:
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-m", "scripts.bench.startup", "--child"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    wall = time.perf_counter() - start
+    result = json.loads(out.strip().splitlines()[-1])
+    result["process_s"] = wall
+    return result
+
+
+def _summarize(runs) -> dict:
+    out = {k: runs[-1][k] for k in ("status", "items", "seeded", "heavy_imported")}
+    for key in ("import_s", "boot_s", "first_response_s", "stats_s", "process_s"):
+        out[key] = round(statistics.median(r[key] for r in runs), 4)
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=100_000, help="items in the dataset scenario")
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    if args.child:
+        return _child()
+
+    report = {"benchmark": "startup", "runs": args.runs, "scenarios": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for scenario in ("seed", "dataset"):
+            data_dir = os.path.join(tmp, scenario)
+            env = dict(
+                os.environ,
+                DATA_FILE=os.path.join(data_dir, "workflows.json"),
+                DB_FILE=os.path.join(data_dir, "workflows.sqlite3"),
+                HISTORY_DIR=os.path.join(data_dir, "history"),
+                MOMENTUM_FILE=os.path.join(data_dir, "momentum.json"),
+                HTTP_CACHE_FILE=os.path.join(data_dir, "http_cache.sqlite3"),
+                LEADER_LOCK_FILE=os.path.join(tmp, "leader.lock"),
+                INGEST_LOCK_FILE=os.path.join(tmp, "ingest.lock"),
+                LEADER_RETRY_S="3600",
+            )
+            if scenario == "dataset":
+                # Populate the store in a child too, so settings pick up this env
+                subprocess.run(
+                    [sys.executable, "-m", "scripts.bench.synth", "--rows", str(args.rows), "--store"],
+                    env=env,
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                )
+            from app.sched.leader import FileLock
+
+            leader = FileLock(env["LEADER_LOCK_FILE"])
+            if not leader.acquire():
+                print("could not take the leader lock", file=sys.stderr)
+                return 1
+            try:
+                runs = [_run_once(env) for _ in range(args.runs)]
+            finally:
+                leader.release()
+            report["scenarios"][scenario] = _summarize(runs)
+            if scenario == "dataset":
+                report["scenarios"][scenario]["rows"] = args.rows
+
+    print(json.dumps(report, indent=2))
+    return 0 if all(s["status"] == 200 and not s["heavy_imported"] for s in report["scenarios"].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
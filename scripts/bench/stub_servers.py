@@ -0,0 +1,228 @@
+"""Local stand-ins for the YouTube Data API, a Discourse forum and Google Trends.
+
+Responses are deterministic and every request sleeps ``latency`` seconds to
+model network round-trips, so benchmarks measure scheduling, not the internet.
+pytrends has its endpoints hard-coded; ``pytrends_redirect`` points them here.
+"""
+from __future__ import annotations
+import contextlib
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+def _youtube_search(qs: Dict[str, list]) -> Dict[str, Any]:
+    region = qs.get("regionCode", ["US"])[0]
+    n = int(qs.get("maxResults", ["50"])[0])
+    return {"items": [{"id": {"kind": "youtube#video", "videoId": f"{region}{i:04d}"}} for i in range(n)]}
+
+
+def _youtube_videos(qs: Dict[str, list]) -> Dict[str, Any]:
+    ids = [i for i in qs.get("id", [""])[0].split(",") if i]
+    items = []
+    for vid in ids:
+        n = int(re.sub(r"\D", "", vid) or 0)
+        items.append(
+            {
+                "id": vid,
+                "snippet": {"title": f"n8n workflow video {vid}"},
+                "statistics": {"viewCount": str(1000 + 137 * n), "likeCount": str(10 + 3 * n), "commentCount": str(n)},
+            }
+        )
+    return {"items": items}
+
+
+def _forum_list(first: int, count: int) -> Dict[str, Any]:
+    topics = [
+        {
+            "id": tid,
+            "title": f"Topic {tid}",
+            "reply_count": tid % 17,
+            "like_count": tid % 11,
+            "views": 50 * tid,
+            "participant_count": tid % 7,
+            "bumped_at": f"2025-01-{1 + tid % 28:02d}T00:00:00.000Z",
+        }
+        for tid in range(first, first + count)
+    ]
+    return {"topic_list": {"topics": topics}}
+
+
+def _forum_topic(tid: int) -> Dict[str, Any]:
+    return {"id": tid, "details": {"participants": [{"id": i} for i in range(tid % 9)]}}
+
+
+# Regions returned by the interest_by_region stub (geoCode, geoName)
+TRENDS_REGIONS = (
+    ("AU", "Australia"), ("BR", "Brazil"), ("CA", "Canada"), ("DE", "Germany"), ("ES", "Spain"),
+    ("FR", "France"), ("GB", "United Kingdom"), ("IN", "India"), ("IT", "Italy"), ("JP", "Japan"),
+    ("MX", "Mexico"), ("NL", "Netherlands"), ("PL", "Poland"), ("SE", "Sweden"), ("US", "United States"),
+)
+TRENDS_WEEKS = 52
+
+
+def _interest(*parts: Any) -> int:
+    return int(hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:4], 16) % 101
+
+
+def _trends_keywords(qs: Dict[str, list]) -> Tuple[List[str], str]:
+    req = json.loads(qs.get("req", ["{}"])[0])
+    items = req.get("comparisonItem") or []
+    if items:
+        return [c.get("keyword", "") for c in items], items[0].get("geo", "")
+    return req.get("keywords", []), req.get("geo", "")
+
+
+def _trends_explore(qs: Dict[str, list]) -> Dict[str, Any]:
+    keywords, geo = _trends_keywords(qs)
+    request = {"keywords": keywords, "geo": geo}
+    return {
+        "widgets": [
+            {"id": "TIMESERIES", "request": request, "token": "timeseries"},
+            {"id": "GEO_MAP", "request": dict(request), "token": "geo"},
+        ]
+    }
+
+
+def _trends_multiline(qs: Dict[str, list]) -> Dict[str, Any]:
+    keywords, geo = _trends_keywords(qs)
+    start = 1_700_000_000
+    timeline = [
+        {
+            "time": str(start + week * 7 * 86400),
+            "value": [_interest(kw, geo, week) for kw in keywords],
+            "isPartial": week == TRENDS_WEEKS - 1,
+        }
+        for week in range(TRENDS_WEEKS)
+    ]
+    return {"default": {"timelineData": timeline}}
+
+
+def _trends_comparedgeo(qs: Dict[str, list]) -> Dict[str, Any]:
+    keywords, _ = _trends_keywords(qs)
+    rows = [{"geoCode": code, "geoName": name, "value": [_interest(kw, code) for kw in keywords]} for code, name in TRENDS_REGIONS]
+    return {"default": {"geoMapData": rows}}
+
+
+# Trends JSON comes behind an anti-XSSI prefix that pytrends trims by length
+TRENDS_ROUTES = {
+    "/trends/api/explore": (_trends_explore, ")]}'"),
+    "/trends/api/widgetdata/multiline": (_trends_multiline, ")]}',"),
+    "/trends/api/widgetdata/comparedgeo": (_trends_comparedgeo, ")]}',"),
+}
+
+
+@contextlib.contextmanager
+def pytrends_redirect(base_url: str) -> Iterator[None]:
+    """Point pytrends' hard-coded Google Trends URLs at ``base_url`` for the duration."""
+    from pytrends import request as pt
+
+    old_base = pt.BASE_TRENDS_URL
+    saved = {name: getattr(pt.TrendReq, name) for name in dir(pt.TrendReq) if name.endswith("_URL")}
+    pt.BASE_TRENDS_URL = f"{base_url}/trends"
+    for name, url in saved.items():
+        setattr(pt.TrendReq, name, url.replace(old_base, pt.BASE_TRENDS_URL))
+    try:
+        yield
+    finally:
+        pt.BASE_TRENDS_URL = old_base
+        for name, url in saved.items():
+            setattr(pt.TrendReq, name, url)
+
+
+def route(path: str, query: str) -> Tuple[int, Dict[str, Any]]:
+    qs = parse_qs(query)
+    if path.endswith("/youtube/v3/search"):
+        return 200, _youtube_search(qs)
+    if path.endswith("/youtube/v3/videos"):
+        return 200, _youtube_videos(qs)
+    if path == "/latest.json":
+        return 200, _forum_list(1, 30)
+    if path == "/top/weekly.json":
+        return 200, _forum_list(21, 30)
+    m = re.fullmatch(r"/t/(\d+)\.json", path)
+    if m:
+        return 200, _forum_topic(int(m.group(1)))
+    return 404, {"error": "not found"}
+
+
+class StubServer:
+    """Threaded HTTP/1.1 server on an ephemeral localhost port."""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.requests += 1
+                time.sleep(server.latency)
+                parts = urlsplit(self.path)
+                if parts.path.startswith("/trends/"):
+                    return self._trends(parts.path, parts.query)
+                status, payload = route(parts.path, parts.query)
+                body = json.dumps(payload).encode()
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            # pytrends POSTs the explore request with its payload in the query string
+            do_POST = do_GET
+
+            def _trends(self, path: str, query: str):
+                handler = TRENDS_ROUTES.get(path.rstrip("/"))
+                body = b""
+                if handler is not None:
+                    fn, prefix = handler
+                    body = (prefix + json.dumps(fn(parse_qs(query)))).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json; charset=utf-8")
+                else:
+                    # Cookie bootstrap (/trends/explore/) and anything else
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html")
+                    self.send_header("Set-Cookie", "NID=bench; Path=/")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
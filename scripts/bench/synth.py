@@ -0,0 +1,123 @@
+"""Synthetic workflow items shaped like seeds/workflows_seed.json.
+
+Titles are drawn from the seed workflows, metrics from heavy-tailed
+distributions per platform, and every item gets a unique source id, so the
+output exercises the same code paths as real ingestion data.
+
+    python -m scripts.bench.synth --rows 1000000 --out items.ndjson
+    python -m scripts.bench.synth --rows 100000 --store   # into DB_FILE / DATA_FILE
+
+``--out`` streams NDJSON (or a JSON array for ``.json``), so 5M rows need
+no more memory than one item; ``--store`` saves through ``repository.save_all``.
+"""
+from __future__ import annotations
+import argparse
+import json
+import pathlib
+import random
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from app.store.sqlite_store import item_key
+from app.utils.scoring import compute_popularity
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+SEED_FILE = ROOT / "seeds" / "workflows_seed.json"
+PLATFORM_MIX = (("YouTube", 0.5), ("Forum", 0.35), ("Google", 0.15))
+
+
+def seed_titles() -> List[str]:
+    try:
+        return sorted({it["workflow"] for it in json.loads(SEED_FILE.read_text(encoding="utf-8"))})
+    except (OSError, ValueError, KeyError):
+        return ["n8n workflow"]
+
+
+def _metrics(platform: str, rng: random.Random) -> Dict[str, Any]:
+    if platform == "YouTube":
+        views = int(rng.lognormvariate(9, 2))
+        return {"views": views, "likes": int(views * rng.uniform(0, 0.08)), "comments": int(views * rng.uniform(0, 0.01))}
+    if platform == "Forum":
+        return {
+            "replies": int(rng.expovariate(1 / 8)),
+            "likes": int(rng.expovariate(1 / 5)),
+            "contributors": int(rng.expovariate(1 / 4)),
+            "views": int(rng.lognormvariate(6, 1.5)),
+        }
+    return {"interest_score": round(rng.uniform(0, 100), 2), "trend_30d_change": round(rng.gauss(0, 0.4), 4)}
+
+
+def generate_items(
+    n: int, countries: Sequence[str] = ("US", "IN"), seed: int = 42, titles: Optional[List[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yield ``n`` scored items with stable ids (deterministic for a given seed)."""
+    rng = random.Random(seed)
+    titles = titles or seed_titles()
+    platforms = [p for p, _ in PLATFORM_MIX]
+    weights = [w for _, w in PLATFORM_MIX]
+    for i in range(n):
+        platform = rng.choices(platforms, weights)[0]
+        country = countries[i % len(countries)]
+        title = f"{rng.choice(titles)} #{i}"
+        if platform == "YouTube":
+            url, meta = f"https://www.youtube.com/watch?v=syn{i:08d}", {"video_id": f"syn{i:08d}"}
+        elif platform == "Forum":
+            url, meta = f"https://community.n8n.io/t/{i}", {"topic_id": i}
+        else:
+            url, meta = None, {"keyword": title, "timeframe": "today 12-m"}
+        metrics, score = compute_popularity(platform, _metrics(platform, rng))
+        item = {
+            "workflow": title,
+            "platform": platform,
+            "popularity_metrics": metrics,
+            "country": country,
+            "source_url": url,
+            "source_metadata": meta,
+            "popularity_score": score,
+        }
+        item["id"] = item_key(item)
+        yield item
+
+
+def write_items(items: Iterator[Dict[str, Any]], path: str) -> int:
+    """Stream items to ``path``: a JSON array for ``.json``, NDJSON otherwise."""
+    as_array = path.endswith(".json")
+    n = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n" if as_array else "")
+        for it in items:
+            if as_array and n:
+                f.write(",\n")
+            f.write(json.dumps(it, ensure_ascii=False, separators=(",", ":")))
+            f.write("" if as_array else "\n")
+            n += 1
+        f.write("\n]\n" if as_array else "")
+    return n
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=10_000)
+    ap.add_argument("--countries", default="US,IN", help="comma-separated ISO codes, assigned round-robin")
+    ap.add_argument("--seed", type=int, default=42)
+    dest = ap.add_mutually_exclusive_group(required=True)
+    dest.add_argument("--out", help="write to this file (.json array, otherwise NDJSON)")
+    dest.add_argument("--store", action="store_true", help="save into the configured store")
+    args = ap.parse_args(argv)
+
+    items = generate_items(args.rows, [c.strip() for c in args.countries.split(",") if c.strip()], args.seed)
+    start = time.perf_counter()
+    if args.out:
+        write_items(items, args.out)
+    else:
+        from app.store import repository
+
+        repository.save_all(list(items))
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"rows": args.rows, "destination": args.out or "store", "seconds": round(elapsed, 3)}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
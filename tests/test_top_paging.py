@@ -0,0 +1,54 @@
+import json
+import os
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.store import repository
+
+SHIPPED_DATA = os.path.join(settings.BASE_DIR, "store", "data", "workflows.json")
+
+
+@pytest.fixture
+def json_store(tmp_path, monkeypatch):
+    """The shipped workflows.json (id-less items) served through the JSON backend."""
+    data_file = tmp_path / "workflows.json"
+    shutil.copy(SHIPPED_DATA, data_file)
+    monkeypatch.setattr(settings, "STORE_BACKEND", "json")
+    monkeypatch.setattr(settings, "DATA_FILE", str(data_file))
+    monkeypatch.setattr(settings, "STATS_FILE", str(tmp_path / "stats.json"))
+    monkeypatch.setattr(repository, "_snapshot", None)
+    monkeypatch.setattr(repository, "_last_poll", 0.0)
+    with open(data_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _page_through(client, params):
+    seen, cursor = [], None
+    while True:
+        resp = client.get("/workflows/top", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert resp.status_code == 200
+        body = resp.json()
+        seen.extend(it["id"] for it in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("sort_by,order", [("popularity_score", "desc"), ("popularity_score", "asc"), ("platform", "desc")])
+def test_top_paging_returns_every_item_once(json_store, sort_by, order):
+    client = TestClient(app)
+    seen = _page_through(client, {"sort_by": sort_by, "order": order, "limit": 10})
+    assert len(seen) == len(json_store)
+    assert len(set(seen)) == len(json_store)
+
+
+def test_keyed_tie_breaker_without_ids(json_store):
+    # Items that never got an id still need distinct tie-breakers
+    items = [{k: v for k, v in it.items() if k != "id"} for it in json_store]
+    snapshot = repository._build_snapshot(items, None)
+    keys = [key for key, _ in snapshot.keyed(None, None, "platform", True)]
+    assert len(set(keys)) == len(items)